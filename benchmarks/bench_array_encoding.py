@@ -0,0 +1,59 @@
+"""
+Micro-benchmark: OPENDTECT log array serialization.
+
+Compares the former array_check closure (list comprehension + str +
+replace) against py_to_psql's encoders: list literal (log_column_literal,
+array mode), COPY text literal and COPY binary.
+
+Usage:
+    python benchmarks/bench_array_encoding.py [n_samples] [repeat]
+"""
+import os
+import sys
+import timeit
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import py_to_psql as pp
+
+def array_check(array): return(
+    str(
+        [None if sample == 1e+30 else sample for sample in array]
+    ).replace("None", "Null")
+)
+
+def synthetic_log(n_samples, null_ratio=0.1, seed=0):
+    """
+    Creates a GR-like log as a wellman list with 1e30 undefined samples.
+    """
+    rng = np.random.default_rng(seed)
+    log = rng.normal(75, 20, n_samples).round(5)
+    log[rng.random(n_samples) < null_ratio] = 1e+30
+    return log.tolist()
+
+def main(n_samples=20000, repeat=20):
+    log = synthetic_log(n_samples)
+    # Same output (modulo NULL spelling)
+    closure_result = "array" + array_check(log)
+    literal_result = pp.log_column_literal(log)
+    assert closure_result.replace("Null", "NULL") == literal_result
+
+    cases = {
+        "array_check closure": lambda: "array" + array_check(log),
+        "literal": lambda: pp.log_column_literal(log),
+        "literal from NumPy": lambda: pp.array_to_psql_literal(pp.encode_log_array(log)),
+        "COPY text": lambda: pp.log_column_literal(log, copy=True),
+        "COPY binary": lambda: pp.array_to_copy_binary(pp.encode_log_array(log)),
+    }
+    # cases are interleaved, so load spikes hit all of them alike
+    best = dict.fromkeys(cases, float("inf"))
+    for _ in range(repeat):
+        for name, case in cases.items():
+            best[name] = min(best[name], timeit.timeit(case, number=1))
+    print(f"{n_samples} samples, best of {repeat} runs")
+    baseline = best["array_check closure"]
+    for name in cases:
+        print(f"{name:<25}{best[name] * 1e3:>10.3f} ms{baseline / best[name]:>8.2f}x")
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
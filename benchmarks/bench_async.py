@@ -0,0 +1,171 @@
+"""
+Benchmark: asynchronous API vs the synchronous path over a latency
+injected connection.
+
+A local TCP proxy delays every packet by latency_ms (each way) between
+the client and the throwaway PostgreSQL of bench_suite (or PSQL_DSN,
+which must be a TCP host). Compares, for every well:
+    - one slice query per well: fetch_psql_command vs
+        async_fetch_psql_commands
+    - unnested_logs_to_df one well at a time vs async_unnested_logs_to_df
+    - insert_logs (array mode) vs async_insert_logs
+
+Usage:
+    python benchmarks/bench_async.py [n_wells] [n_samples] [latency_ms] [concurrency]
+"""
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+import pandas as pd
+import psycopg2 as p
+from psycopg2.extensions import make_dsn, parse_dsn
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bench_suite
+from bench_suite import fake_wellman, op, pp, LOG_NAME
+
+class LatencyProxy:
+    """
+    TCP proxy delivering every chunk latency seconds after its arrival, in
+    both directions. Runs its own event loop in a daemon thread.
+    """
+    def __init__(self, host, port, latency):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self.handle, "127.0.0.1", 0)
+            )
+            self.proxy_port = self.server.sockets[0].getsockname()[1]
+            started.set()
+            self.loop.run_forever()
+        threading.Thread(target=run, daemon=True).start()
+        started.wait()
+
+    async def pipe(self, reader, writer):
+        chunks = asyncio.Queue()
+        async def receive():
+            while True:
+                data = await reader.read(65536)
+                await chunks.put((time.perf_counter() + self.latency, data))
+                if not data:
+                    break
+        receiver = asyncio.ensure_future(receive())
+        try:
+            while True:
+                deliver_at, data = await chunks.get()
+                await asyncio.sleep(max(0, deliver_at - time.perf_counter()))
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+        finally:
+            receiver.cancel()
+            writer.close()
+
+    async def handle(self, reader, writer):
+        upstream_reader, upstream_writer = await asyncio.open_connection(self.host, self.port)
+        await asyncio.gather(
+            self.pipe(reader, upstream_writer),
+            self.pipe(upstream_reader, writer),
+            return_exceptions=True
+        )
+
+def timed(func):
+    with contextlib.redirect_stdout(io.StringIO()):
+        init = time.perf_counter()
+        result = func()
+        return time.perf_counter() - init, result
+
+def main(n_wells=64, n_samples=5000, latency_ms=5, concurrency=8):
+    fake_wellman.configure(n_wells=n_wells, n_samples=n_samples)
+    well_names = fake_wellman.getNames()
+    with bench_suite.local_postgres() as dsn:
+        connection = p.connect(dsn)
+        with contextlib.redirect_stdout(io.StringIO()):
+            bench_suite.create_tables(connection, well_names)
+            op.insert_logs(well_names, LOG_NAME, "bench_gr", "bench_wells", connection, mode="copy")
+            op.insert_markers(well_names, "bench_markers", connection)
+        marker_result = pp.fetch_psql_command(
+            "SELECT well_name, top_zechstein, top_rotliegendes FROM bench_markers", connection
+        )
+        marker_df = pd.DataFrame(marker_result[1], columns=marker_result[0])
+        dsn_parameters = parse_dsn(dsn)
+        proxy = LatencyProxy(
+            dsn_parameters.get("host", "127.0.0.1"),
+            int(dsn_parameters.get("port", 5432)),
+            latency_ms / 1000
+        )
+        proxied_dsn = make_dsn(dsn, host="127.0.0.1", port=proxy.proxy_port)
+        sync_connection = p.connect(proxied_dsn)
+        pool = pp.ConnectionPool(
+            minconn=concurrency, maxconn=concurrency, health_check=False, dsn=proxied_dsn
+        )
+        slice_queries = [
+            pp.slice_unnest_data_query(
+                row[0], ["well_name", "md_in_m", "gr"], "bench_gr", "bench_markers",
+                "top_zechstein", row[1], "top_rotliegendes", row[2],
+                md_column_name="md_in_m"
+            )
+            for row in marker_df.values
+        ]
+        def sync_slices():
+            results = []
+            for start in range(len(marker_df)):
+                results += [pp.unnested_logs_to_df(
+                    marker_df.iloc[start:start + 1], "well_name", "md_in_m", "gr",
+                    "bench_gr", "bench_markers", sync_connection
+                )]
+            return pd.concat(results, ignore_index=True)
+        def sync_insert():
+            pp.execute_psql_command("TRUNCATE bench_gr", connection)
+            op.insert_logs(
+                well_names, LOG_NAME, "bench_gr", "bench_wells", sync_connection, mode="array"
+            )
+            return pp.fetch_psql_command("SELECT well_name FROM bench_gr", connection)[1]
+        def async_insert():
+            pp.execute_psql_command("TRUNCATE bench_gr", connection)
+            asyncio.run(op.async_insert_logs(
+                well_names, LOG_NAME, "bench_gr", "bench_wells", pool, concurrency=concurrency
+            ))
+            return pp.fetch_psql_command("SELECT well_name FROM bench_gr", connection)[1]
+        scenarios = [
+            (
+                "fetch, one query per well",
+                lambda: [pp.fetch_psql_command(query, sync_connection) for query in slice_queries],
+                lambda: asyncio.run(pp.async_fetch_psql_commands(slice_queries, pool, concurrency))
+            ),
+            (
+                "unnested_logs_to_df, per well",
+                sync_slices,
+                lambda: asyncio.run(pp.async_unnested_logs_to_df(
+                    marker_df, "well_name", "md_in_m", "gr", "bench_gr", "bench_markers",
+                    pool, concurrency=concurrency, wells_per_query=1
+                ))
+            ),
+            ("insert_logs (array)", sync_insert, async_insert)
+        ]
+        print(
+            f"{n_wells} wells, {latency_ms} ms latency each way, concurrency {concurrency}\n"
+            f"{'benchmark':<32}{'sync (s)':>10}{'async (s)':>11}{'speedup':>9}"
+        )
+        for name, sync_func, async_func in scenarios:
+            sync_time, sync_result = timed(sync_func)
+            async_time, async_result = timed(async_func)
+            print(f"{name:<32}{sync_time:>10.3f}{async_time:>11.3f}{sync_time / async_time:>8.1f}x")
+            if len(sync_result) != len(async_result):
+                print(f"    result sizes differ: {len(sync_result)} vs {len(async_result)}")
+        pool.closeall()
+        sync_connection.close()
+        connection.close()
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:5]])
@@ -0,0 +1,46 @@
+"""
+Micro-benchmark: DataFrame column to PSQL array serialization.
+
+Compares the former df_cols_to_query encoding (str(list) + replace
+"nan") against py_to_psql.series_to_psql_array, per column type of a
+lithostratigraphic DataFrame (see bench_suite.litho_df).
+
+Usage:
+    python benchmarks/bench_df_encoding.py [n_rows] [repeat]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_suite import litho_df, pp
+
+def former_array(series):
+    return f"array{series.to_list()}".replace("nan", "NULL")
+
+def main(n_rows=20000, repeat=20):
+    df = litho_df(n_rows)
+    cases = {}
+    for column in df.columns:
+        series = df[column]
+        cases[f"{column} former"] = lambda series=series: former_array(series)
+        cases[f"{column} series_to_psql_array"] = lambda series=series: pp.series_to_psql_array(series)
+    cases["df_cols_values"] = lambda: pp.df_cols_values(df, "BENCH-00000")
+    # cases are interleaved, so load spikes hit all of them alike
+    best = dict.fromkeys(cases, float("inf"))
+    for _ in range(repeat):
+        for name, case in cases.items():
+            best[name] = min(best[name], timeit.timeit(case, number=1))
+    print(f"{n_rows} rows, best of {repeat} runs")
+    for column in df.columns:
+        baseline = best[f"{column} former"]
+        for name in [f"{column} former", f"{column} series_to_psql_array"]:
+            print(f"{name:<45}{best[name] * 1e3:>10.3f} ms{baseline / best[name]:>8.2f}x")
+    former_total = sum(best[f"{column} former"] for column in df.columns)
+    print(
+        f"{'df_cols_values':<45}{best['df_cols_values'] * 1e3:>10.3f} ms"
+        f"{former_total / best['df_cols_values']:>8.2f}x"
+    )
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,85 @@
+"""
+Benchmark: log table encodings (see py_to_psql.log_table_creation).
+
+Loads the same synthetic wells into one table per encoding and reports 
+table size and slice query latency through unnested_logs_to_df.
+
+Creates throwaway tables (bench_enc_*) in the database given by the 
+PSQL_DSN environment variable.
+
+Usage:
+    PSQL_DSN="dbname=bench user=postgres" \\
+        python benchmarks/bench_log_encodings.py [n_wells] [n_samples]
+"""
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import psycopg2 as p
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import py_to_psql as pp
+
+def main(n_wells=100, n_samples=20000, repeat=5):
+    connection = p.connect(os.environ.get("PSQL_DSN", "dbname=postgres"))
+    rng = np.random.default_rng(0)
+    wells = []
+    for index in range(n_wells):
+        md = 1000 + np.arange(n_samples) * 0.1524
+        gr = rng.normal(75, 20, n_samples)
+        gr[rng.random(n_samples) < 0.05] = np.nan
+        wells += [(f"BENCH-{index:05d}", md, gr)]
+    # markers: middle third of every well
+    pp.execute_psql_command("DROP TABLE IF EXISTS bench_enc_markers", connection)
+    pp.wells_table_creation("bench_enc_markers", connection, column_list=[
+        "well_name VARCHAR(30) NOT NULL UNIQUE,",
+        "top_a NUMERIC(9,2),",
+        "base_a NUMERIC(9,2)"
+    ])
+    markers = []
+    for well_name, md, _ in wells:
+        top, base = round(md[n_samples // 3], 2), round(md[2 * n_samples // 3], 2)
+        markers += [[well_name, top, None, base]]
+        pp.execute_psql_command(
+            f"INSERT INTO bench_enc_markers VALUES ('{well_name}', {top}, {base})", connection
+        )
+    marker_df = pd.DataFrame(markers, columns=["well_name", "top_a", "unused", "base_a"])
+
+    print(f"{n_wells} wells x {n_samples} samples, best of {repeat}")
+    print(f"{'encoding':<10}{'size (MB)':>12}{'unnest (s)':>12}{'index (s)':>12}")
+    for encoding in pp.LOG_ENCODINGS:
+        table_name = f"bench_enc_{encoding}"
+        pp.execute_psql_command(f"DROP TABLE IF EXISTS {table_name}", connection)
+        pp.log_table_creation(table_name, connection, ["gr"], encoding=encoding, wells_table=None)
+        column_types = pp.fetch_column_types(table_name, connection)
+        for well_name, md, gr in wells:
+            pp.execute_psql_command(
+                f"INSERT INTO {table_name} VALUES ('{well_name}', "
+                f"{pp.log_column_literal(md, column_types[1])}, "
+                f"{pp.log_column_literal(gr, column_types[2])}, 'GR')",
+                connection
+            )
+        # VACUUM can't run inside a transaction
+        connection.autocommit = True
+        pp.execute_psql_command(f"VACUUM ANALYZE {table_name}", connection)
+        connection.autocommit = False
+        size = pp.fetch_psql_command(
+            f"SELECT pg_total_relation_size('{table_name}')", connection
+        )[1][0][0] / 1e6
+        timings = []
+        for slicing in ["unnest", "index"]:
+            runs = []
+            for _ in range(repeat):
+                init = time.perf_counter()
+                pp.unnested_logs_to_df(
+                    marker_df, "well_name", "md_in_m", "gr", table_name, 
+                    "bench_enc_markers", connection, slicing=slicing
+                )
+                runs += [time.perf_counter() - init]
+            timings += [min(runs)]
+        print(f"{encoding:<10}{size:>12.2f}{timings[0]:>12.3f}{timings[1]:>12.3f}")
+    connection.close()
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,74 @@
+"""
+Benchmark: unnested_logs_to_df, one query per well vs a single set-based
+query, for a growing number of wells.
+
+Creates throwaway tables (bench_wells, bench_markers, bench_gr) in the 
+database given by the PSQL_DSN environment variable.
+
+Usage:
+    PSQL_DSN="dbname=bench user=postgres" \\
+        python benchmarks/bench_multiwell_slice.py [max_wells] [n_samples]
+"""
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import psycopg2 as p
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import py_to_psql as pp
+
+def create_tables(connection, n_wells, n_samples, seed=0):
+    rng = np.random.default_rng(seed)
+    for table in ["bench_gr", "bench_markers"]:
+        pp.execute_psql_command(f"DROP TABLE IF EXISTS {table}", connection)
+    pp.wells_table_creation("bench_markers", connection, column_list=[
+        "well_name VARCHAR(30) NOT NULL UNIQUE,",
+        "top_a NUMERIC(7,2),",
+        "base_a NUMERIC(7,2)"
+    ])
+    pp.wells_table_creation("bench_gr", connection, column_list=[
+        "well_name VARCHAR(30) NOT NULL UNIQUE,",
+        "md_in_m NUMERIC(13,5)[],",
+        "gr NUMERIC(13,5)[],",
+        "log_name VARCHAR(30)"
+    ])
+    markers = []
+    for index in range(n_wells):
+        well_name = f"BENCH-{index:05d}"
+        md = 1000 + np.arange(n_samples) * 0.1524
+        gr = rng.normal(75, 20, n_samples)
+        top = float(md[n_samples // 3])
+        base = float(md[2 * n_samples // 3])
+        markers += [[well_name, top, None, base]]
+        pp.execute_psql_command(
+            f"INSERT INTO bench_markers VALUES ('{well_name}', {top}, {base})", connection
+        )
+        pp.execute_psql_command(
+            f"INSERT INTO bench_gr VALUES ('{well_name}', "
+            f"{pp.array_to_psql_literal(md)}, {pp.array_to_psql_literal(gr)}, 'GR')",
+            connection
+        )
+    return pd.DataFrame(markers, columns=["well_name", "top_a", "unused", "base_a"])
+
+def main(max_wells=256, n_samples=5000):
+    connection = p.connect(os.environ.get("PSQL_DSN", "dbname=postgres"))
+    marker_df = create_tables(connection, max_wells, n_samples)
+    print(f"{'wells':>6}{'per well (s)':>15}{'single query (s)':>19}{'speedup':>9}")
+    n_wells = 1
+    while n_wells <= max_wells:
+        timings = []
+        for per_well in [True, False]:
+            init = time.perf_counter()
+            pp.unnested_logs_to_df(
+                marker_df.iloc[:n_wells], "well_name", "md_in_m", "gr",
+                "bench_gr", "bench_markers", connection, per_well=per_well
+            )
+            timings += [time.perf_counter() - init]
+        print(f"{n_wells:>6}{timings[0]:>15.3f}{timings[1]:>19.3f}{timings[0] / timings[1]:>8.1f}x")
+        n_wells *= 4
+    connection.close()
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
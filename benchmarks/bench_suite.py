@@ -0,0 +1,197 @@
+"""
+Benchmark suite: ingest and query throughput on a synthetic survey.
+
+Uses fake_wellman instead of odpy.wellman and a throwaway PostgreSQL
+cluster (initdb/pg_ctl must be on PATH), or the database given by the
+PSQL_DSN environment variable. Reports latency percentiles (p50, p90,
+p99) and throughput for:
+    - opendtect_to_py.insert_logs (array and copy modes)
+    - opendtect_to_py.insert_markers_query
+    - py_to_psql.unnested_logs_to_df
+    - py_to_psql.df_rows_to_query
+
+Usage:
+    python benchmarks/bench_suite.py [n_wells] [n_samples] [repeat] [json_path]
+"""
+import contextlib
+import io
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import psycopg2 as p
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fake_wellman
+fake_wellman.install()
+import opendtect_to_py as op
+import py_to_psql as pp
+
+LOG_NAME = "Raw CDA Logs`GR [D]"
+
+@contextlib.contextmanager
+def local_postgres():
+    """
+    Yields a DSN: PSQL_DSN if set, otherwise a throwaway cluster that is
+    removed on exit.
+    """
+    if os.environ.get("PSQL_DSN"):
+        yield os.environ["PSQL_DSN"]
+        return
+    if shutil.which("initdb") is None or shutil.which("pg_ctl") is None:
+        raise RuntimeError("initdb/pg_ctl not found: add them to PATH or set PSQL_DSN")
+    data_dir = tempfile.mkdtemp(prefix="bench_pg_")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    subprocess.run(
+        ["initdb", "-D", data_dir, "-U", "postgres", "-A", "trust"],
+        check=True, stdout=subprocess.DEVNULL
+    )
+    subprocess.run(
+        ["pg_ctl", "-D", data_dir, "-l", os.path.join(data_dir, "log"), "-w", "start",
+         "-o", f"-p {port} -k {data_dir} -c listen_addresses=127.0.0.1 -c fsync=off"],
+        check=True, stdout=subprocess.DEVNULL
+    )
+    try:
+        yield f"host=127.0.0.1 port={port} user=postgres dbname=postgres"
+    finally:
+        subprocess.run(
+            ["pg_ctl", "-D", data_dir, "-m", "immediate", "stop"],
+            stdout=subprocess.DEVNULL
+        )
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+def measure(name, func, calls, units, unit_name):
+    """
+    Runs func once per call argument, with its prints silenced.
+
+    RETURN
+    ------
+        dict
+            Latency percentiles (s) and throughput (units/s).
+    """
+    latencies = []
+    for call in calls:
+        with contextlib.redirect_stdout(io.StringIO()):
+            init = time.perf_counter()
+            func(call)
+            latencies += [time.perf_counter() - init]
+    latencies = np.array(latencies)
+    result = {
+        "name": name,
+        "calls": len(latencies),
+        "p50": float(np.percentile(latencies, 50)),
+        "p90": float(np.percentile(latencies, 90)),
+        "p99": float(np.percentile(latencies, 99)),
+        "throughput": units * len(latencies) / float(latencies.sum()),
+        "unit": unit_name
+    }
+    print(
+        f"{name:<34}{result['calls']:>6}{result['p50']:>10.4f}{result['p90']:>10.4f}"
+        f"{result['p99']:>10.4f}{result['throughput']:>14.1f} {unit_name}/s"
+    )
+    return result
+
+def create_tables(connection, well_names):
+    for table in ["bench_litho", "bench_markers", "bench_gr", "bench_wells"]:
+        pp.execute_psql_command(f"DROP TABLE IF EXISTS {table} CASCADE", connection)
+    pp.wells_table_creation("bench_wells", connection)
+    values = ", ".join(
+        f"({info['ID']}, '{info['Name']}', {info['X']}, {info['Y']}, '{info['Status']}')"
+        for info in map(fake_wellman.getInfo, well_names)
+    )
+    pp.execute_psql_command(
+        "INSERT INTO bench_wells(opendtect_id, well_name, x_coordinate, y_coordinate, status) "
+        f"VALUES {values}",
+        connection
+    )
+    pp.log_table_creation("bench_gr", connection, ["gr"], wells_table="bench_wells")
+    marker_columns = ["well_name VARCHAR(30) UNIQUE NOT NULL REFERENCES bench_wells(well_name)"]
+    marker_columns += [
+        f", {pp.string_replacement(marker)} NUMERIC(7,2)" for marker in fake_wellman.MARKER_NAMES
+    ]
+    pp.wells_table_creation("bench_markers", connection, column_list=marker_columns)
+    pp.wells_table_creation("bench_litho", connection, column_list=[
+        "litho_id INTEGER PRIMARY KEY,",
+        "well_name VARCHAR(30),",
+        "top_down_hole_depth_m NUMERIC(9,2),",
+        "litho_1 VARCHAR(30),",
+        "pct_litho_1 NUMERIC(5,2)"
+    ])
+
+def litho_df(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "litho_id": np.arange(n_rows),
+        "well_name": [f"BENCH-{index % 100:05d}" for index in range(n_rows)],
+        "top_down_hole_depth_m": rng.uniform(500, 4000, n_rows).round(2),
+        "litho_1": rng.choice(["Sandstone", "Shale", "Anhydrite", "Halite"], n_rows),
+        "pct_litho_1": rng.uniform(0, 100, n_rows).round(2)
+    })
+    df.loc[rng.random(n_rows) < 0.05, "pct_litho_1"] = np.nan
+    return df
+
+def main(n_wells=100, n_samples=20000, repeat=5, json_path=None):
+    fake_wellman.configure(n_wells=n_wells, n_samples=n_samples)
+    well_names = fake_wellman.getNames()
+    results = []
+    with local_postgres() as dsn:
+        connection = p.connect(dsn)
+        create_tables(connection, well_names)
+        print(f"{'benchmark':<34}{'calls':>6}{'p50 (s)':>10}{'p90 (s)':>10}{'p99 (s)':>10}{'throughput':>14}")
+        # insert_logs: whole survey per call, table emptied between calls
+        for mode in ["array", "copy"]:
+            def insert_logs(_):
+                pp.execute_psql_command("TRUNCATE bench_gr", connection)
+                op.insert_logs(well_names, LOG_NAME, "bench_gr", "bench_wells", connection, mode=mode)
+            results += [measure(
+                f"insert_logs ({mode})", insert_logs, range(repeat), n_wells * n_samples, "samples"
+            )]
+        # insert_markers_query: one well per call
+        results += [measure(
+            "insert_markers_query + execute",
+            lambda well_name: pp.execute_psql_command(
+                op.insert_markers_query(well_name, "bench_markers", pp.on_conflict_update(
+                    pp.fetch_column_names("bench_markers", connection)
+                )), connection
+            ),
+            well_names, 1, "wells"
+        )]
+        # unnested_logs_to_df: every well, one marker interval
+        marker_result = pp.fetch_psql_command(
+            "SELECT well_name, top_zechstein, top_rotliegendes FROM bench_markers", connection
+        )
+        marker_df = pd.DataFrame(marker_result[1], columns=marker_result[0])
+        for slicing in ["unnest", "index"]:
+            results += [measure(
+                f"unnested_logs_to_df ({slicing})",
+                lambda _: pp.unnested_logs_to_df(
+                    marker_df, "well_name", "md_in_m", "gr", "bench_gr", "bench_markers",
+                    connection, slicing=slicing
+                ),
+                range(repeat), n_wells, "wells"
+            )]
+        # df_rows_to_query: 10k rows per call
+        df = litho_df(10000)
+        def rows_to_query(_):
+            pp.execute_psql_command("TRUNCATE bench_litho", connection)
+            pp.execute_psql_command(pp.df_rows_to_query(df, "bench_litho", connection), connection)
+        results += [measure("df_rows_to_query + execute", rows_to_query, range(repeat), len(df), "rows")]
+        connection.close()
+    if json_path:
+        with open(json_path, "w") as json_file:
+            json.dump({
+                "settings": dict(fake_wellman.SETTINGS, repeat=repeat),
+                "results": results
+            }, json_file, indent=2)
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:4]], *sys.argv[4:5])
@@ -0,0 +1,64 @@
+"""
+Benchmark: Upscaling.ipynb cell loop vs py_to_psql.upscale_logs.
+
+Usage:
+    python benchmarks/bench_upscaling.py [n_wells] [n_samples]
+"""
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import py_to_psql as pp
+
+LOG_COLUMNS = ["gr", "dtco", "dtsh", "rhob", "nphi", "drho", "pef"]
+
+def synthetic_sliced_logs(n_wells, n_samples, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for index in range(n_wells):
+        df = pd.DataFrame(
+            rng.normal(50, 10, (n_samples, len(LOG_COLUMNS))), columns=LOG_COLUMNS
+        )
+        df.insert(0, "md_in_m", 2000 + rng.random() + np.arange(n_samples) * 0.1524)
+        df.insert(0, "well_name", f"BENCH-{index:03d}")
+        frames += [df]
+    return pd.concat(frames, ignore_index=True)
+
+def notebook_loop(sliced_logs, cell_width=1):
+    # Upscaling.ipynb
+    upscaled_df = pd.DataFrame(columns=["well_name", "md_in_m"] + LOG_COLUMNS)
+    upscale_index = 0
+    for well_name in sliced_logs.well_name.unique():
+        df = sliced_logs[sliced_logs["well_name"] == well_name]
+        min_depth = df.min()["md_in_m"]
+        max_depth = df.max()["md_in_m"]
+        for depth in np.arange(min_depth, max_depth, cell_width):
+            upscaled_values = df.loc[
+                (df["md_in_m"] >= depth) 
+                & (df["md_in_m"] < depth + cell_width)
+            ].drop(columns=["md_in_m", "well_name"]).mean()
+            upscaled_df.loc[upscale_index] = [well_name, depth] + upscaled_values.to_list()
+            upscale_index += 1
+    return upscaled_df
+
+def main(n_wells=10, n_samples=5000):
+    sliced_logs = synthetic_sliced_logs(n_wells, n_samples)
+    print(f"{n_wells} wells x {n_samples} samples")
+    init = time.perf_counter()
+    expected = notebook_loop(sliced_logs)
+    loop_time = time.perf_counter() - init
+    print(f"{'notebook loop':<25}{loop_time:>10.3f} s")
+    for how in ["mean", "median", "harmonic"]:
+        init = time.perf_counter()
+        upscaled = pp.upscale_logs(sliced_logs, 1, how=how, log_columns=LOG_COLUMNS)
+        elapsed = time.perf_counter() - init
+        print(f"{'upscale_logs ' + how:<25}{elapsed:>10.3f} s{loop_time / elapsed:>10.1f}x")
+        if how == "mean":
+            # notebook loop also returns empty cells (all NaN)
+            print(f"{'':<25}{len(upscaled)} cells vs {len(expected.dropna(how='all', subset=LOG_COLUMNS))}")
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,130 @@
+"""
+Synthetic stand-in for odpy.wellman, for benchmarks without an OPENDTECT
+survey.
+
+Wells, logs, tracks and markers are generated deterministically from the
+well index, so every run (and every process) sees the same survey.
+Undefined samples use OPENDTECT's 1e30.
+
+Usage:
+    import fake_wellman
+    fake_wellman.configure(n_wells=100, n_samples=20000)
+    fake_wellman.install()   # before importing opendtect_to_py
+    import opendtect_to_py as op
+"""
+import sys
+import time
+import types
+import numpy as np
+
+UNDEFINED_VALUE = 1e+30
+LOG_NAMES = ["Joined Well Logs`GR", "Raw CDA Logs`GR [D]", "DT", "RHOB", "NPHI"]
+MARKER_NAMES = [
+    "Top Zechstein",
+    "Top Rotliegendes",
+    "Base Rotliegendes",
+    "Top Carboniferous",
+    "Top Westphalian"
+]
+
+SETTINGS = {
+    "n_wells": 100,
+    "n_samples": 20000,
+    "step": 0.1524,
+    "undefined_ratio": 0.02,
+    "latency": 0.0,
+    "seed": 0
+}
+
+def configure(**settings):
+    """
+    Updates SETTINGS: n_wells, n_samples, step (md sampling in m),
+    undefined_ratio, latency (seconds added to every call) and seed.
+    """
+    unknown = set(settings) - set(SETTINGS)
+    if unknown:
+        raise KeyError(f"Unknown settings: {sorted(unknown)}")
+    SETTINGS.update(settings)
+
+def install():
+    """
+    Registers this module as odpy.wellman in sys.modules.
+    """
+    odpy = sys.modules.get("odpy") or types.ModuleType("odpy")
+    odpy.wellman = sys.modules[__name__]
+    sys.modules["odpy"] = odpy
+    sys.modules["odpy.wellman"] = sys.modules[__name__]
+
+def _wait():
+    if SETTINGS["latency"]:
+        time.sleep(SETTINGS["latency"])
+
+def _well_index(well_name):
+    index = int(well_name.rsplit("-", 1)[1])
+    if index >= SETTINGS["n_wells"]:
+        raise ValueError(f"Well {well_name} not found")
+    return index
+
+def _rng(well_name, salt=""):
+    seed = [SETTINGS["seed"], _well_index(well_name)] + [ord(char) for char in salt]
+    return np.random.default_rng(seed)
+
+def _md(well_name):
+    top = 500 + 10 * (_well_index(well_name) % 50)
+    return top + np.arange(SETTINGS["n_samples"]) * SETTINGS["step"]
+
+def getNames(reload=False):
+    _wait()
+    return [f"BENCH-{index:05d}" for index in range(SETTINGS["n_wells"])]
+
+def getInfo(well_name):
+    _wait()
+    index = _well_index(well_name)
+    return {
+        "ID": float(index + 1),
+        "Name": well_name,
+        "X": 600000.0 + 250 * (index % 40),
+        "Y": 6000000.0 + 250 * (index // 40),
+        "Status": "Producer" if index % 3 else "Dry"
+    }
+
+def _log_names(well_name):
+    # every fifth well lacks the joined logs
+    if _well_index(well_name) % 5 == 4:
+        return LOG_NAMES[1:]
+    return list(LOG_NAMES)
+
+def getLogNames(well_name):
+    _wait()
+    return _log_names(well_name)
+
+def getLog(well_name, log_name):
+    _wait()
+    if log_name not in _log_names(well_name):
+        raise ValueError(f"Log {log_name} not found for Well {well_name}")
+    rng = _rng(well_name, log_name)
+    values = rng.normal(75, 20, SETTINGS["n_samples"])
+    values[rng.random(SETTINGS["n_samples"]) < SETTINGS["undefined_ratio"]] = UNDEFINED_VALUE
+    return (_md(well_name).tolist(), values.tolist())
+
+def getTrack(well_name):
+    _wait()
+    md = _md(well_name)
+    index = _well_index(well_name)
+    x, y = 600000.0 + 250 * (index % 40), 6000000.0 + 250 * (index // 40)
+    drift = np.cumsum(_rng(well_name, "track").normal(0, 0.01, md.size))
+    return (
+        md.tolist(),
+        (md * 0.98 - 25).tolist(),
+        (x + drift).tolist(),
+        (y + drift).tolist()
+    )
+
+def getMarkers(well_name):
+    _wait()
+    md = _md(well_name)
+    # deeper wells cross more markers
+    n_markers = 2 + _well_index(well_name) % (len(MARKER_NAMES) - 1)
+    depths = np.linspace(md[0], md[-1], n_markers + 2)[1:-1]
+    colors = ["#000000"] * n_markers
+    return (MARKER_NAMES[:n_markers], depths.round(2).tolist(), colors)
@@ -1,28 +1,244 @@
 from email import message
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import re
+import tempfile
 import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from functools import partial
+import numpy as np
+import pandas as pd
 import py_to_psql as pp
 import odpy.wellman as wm
 
-def fetch_opendtect_wells_info():
+# Optional on-disk log cache used by fetch_opendtect_well_log 
+# (see WellLogCache & enable_log_cache)
+LOG_CACHE = None
+
+# Cached wellman log names per well (see fetch_log_names_inventory)
+LOG_NAMES_INVENTORY = {}
+
+def fetch_opendtect_wells_info(reload=True):
     """
    Fetches OPENDTECT wells info. 
    
    Maps OPENDTECT well names into wellman's getInfo method.
    
+   ARGUMENTS
+   ---------
+       reload : bool
+           Forces wellman to reload the well names. True by default.
+   
    RETURNS
    -------
        Generator of dictionaries with well information. 
    """
 
-    well_names = wm.getNames(reload=True)
+    well_names = wm.getNames(reload=reload)
     # wellman lambda function
     def lambdaf(well_name): return (wm.getInfo(well_name)) 
     return map(lambdaf, well_names)
 
-def fetch_opendtect_well_log(well_name, log_name):
+class WellLogCache:
+    """
+    Persistent on-disk cache of wellman logs.
+    
+    Each log is stored as one .npy file per array (depth & values, or the
+    four track arrays) and served as read-only memory maps. Entries are 
+    keyed by survey, well, log and the modification time of the well's 
+    source files, so editing a well in OPENDTECT invalidates its logs. 
+    Least recently used entries are evicted above max_bytes. Missing logs
+    are cached too, so wellman is not asked again until the well changes.
+    Files are written to a temporary file and moved into place, so a 
+    reader never maps a partial array.
+    
+    ARGUMENTS
+    ---------
+        cache_dir : str
+            Cache directory. Created if missing.
+            
+        survey_dir : str
+            OPENDTECT survey directory (the one holding WellInfo).
+            
+        max_bytes : int
+            Cache size bound. 2 GB by default.
+    """
+    def __init__(self, cache_dir, survey_dir, max_bytes=2 * 1024**3):
+        self.cache_dir = cache_dir
+        self.survey_dir = survey_dir
+        self.survey_name = os.path.basename(os.path.normpath(survey_dir))
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index_path = os.path.join(cache_dir, "index.json")
+        try:
+            with open(self._index_path) as index_file:
+                self._index = json.load(index_file)
+        except (OSError, ValueError):
+            self._index = {}
+
+    def source_mtime(self, well_name):
+        """
+        Latest modification time of the well's files in WellInfo 
+        (<well>.<ext> and <well>^<n>.<ext>).
+        
+        Falls back to the modification time of WellInfo itself (changed 
+        when wells' files are added or renamed) if the well's files can't
+        be matched by name.
+        """
+        well_info_dir = os.path.join(self.survey_dir, "WellInfo")
+        file_prefix = glob.escape(re.sub(r"[^\w\-]", "_", well_name))
+        source_files = []
+        # F02-1.* and F02-1^*, but not F02-10.*
+        for pattern in [file_prefix + ".*", file_prefix + "^*"]:
+            source_files += glob.glob(os.path.join(well_info_dir, pattern))
+        if not source_files:
+            try:
+                return os.path.getmtime(well_info_dir)
+            except OSError:
+                return 0.0
+        return max(os.path.getmtime(path) for path in source_files)
+
+    def key(self, well_name, log_name):
+        """
+        Cache key: hash of survey, well, log and source files' mtime.
+        """
+        key_source = f"{self.survey_name}|{well_name}|{log_name}|{self.source_mtime(well_name)}"
+        return hashlib.sha1(key_source.encode("utf-8")).hexdigest()
+
+    def _write_atomic(self, path, write):
+        # unique temporary file: reader processes may share the cache
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as temporary_file:
+                write(temporary_file)
+            os.replace(temporary_path, path)
+        except BaseException:
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+            raise
+
+    def _save_index(self):
+        self._write_atomic(
+            self._index_path, 
+            lambda index_file: index_file.write(json.dumps(self._index).encode("utf-8"))
+        )
+
+    def _evict(self):
+        cached_bytes = sum(entry["bytes"] for entry in self._index.values())
+        by_last_access = sorted(self._index.items(), key=lambda item: item[1]["last_access"])
+        for key, entry in by_last_access:
+            if cached_bytes <= self.max_bytes:
+                break
+            for file_name in entry["files"]:
+                try:
+                    os.remove(os.path.join(self.cache_dir, file_name))
+                except OSError:
+                    pass
+            cached_bytes -= entry["bytes"]
+            del self._index[key]
+
+    def get(self, well_name, log_name):
+        """
+        Returns a log from the cache, reading it from wellman on a miss.
+        
+        RETURN
+        ------
+            Tuple of numpy.memmap
+                Arrays as returned by wellman (read only).
+                
+            Empty list
+                If there isn't any log by log_name related to well_name.
+        """
+        key = self.key(well_name, log_name)
+        with self._lock:
+            entry = self._index.get(key)
+        if entry is not None:
+            try:
+                log = [] if entry.get("missing") else tuple(
+                    np.load(os.path.join(self.cache_dir, file_name), mmap_mode="r") 
+                    for file_name in entry["files"]
+                )
+            except OSError:
+                with self._lock:
+                    self._index.pop(key, None)
+            else:
+                with self._lock:
+                    self.hits += 1
+                    entry["last_access"] = time.time()
+                return log
+        with self._lock:
+            self.misses += 1
+        log = read_opendtect_well_log(well_name, log_name)
+        self.put(key, well_name, log_name, log)
+        return log
+
+    def put(self, key, well_name, log_name, log):
+        """
+        Stores a log (one .npy file per array), or marks it as missing if
+        log is empty.
+        """
+        files = []
+        cached_bytes = 0
+        for index, array in enumerate(log or []):
+            file_name = f"{key}_{index}.npy"
+            file_path = os.path.join(self.cache_dir, file_name)
+            self._write_atomic(
+                file_path, 
+                partial(np.save, arr=np.asarray(array, dtype=np.float64))
+            )
+            files += [file_name]
+            cached_bytes += os.path.getsize(file_path)
+        with self._lock:
+            self._index[key] = {
+                "well_name": well_name,
+                "log_name": log_name,
+                "files": files,
+                "bytes": cached_bytes,
+                "missing": not files,
+                "last_access": time.time()
+            }
+            self._evict()
+            self._save_index()
+
+    def warm(self, well_names, log_names):
+        """
+        Fills the cache with every log of every well.
+        """
+        for well_name in well_names:
+            for log_name in log_names:
+                self.get(well_name, log_name)
+        with self._lock:
+            self._save_index()
+
+def enable_log_cache(cache_dir, survey_dir, max_bytes=2 * 1024**3):
+    """
+    Serves every fetch_opendtect_well_log call from a WellLogCache.
+    
+    RETURN
+    ------
+        WellLogCache
+    """
+    global LOG_CACHE
+    LOG_CACHE = WellLogCache(cache_dir, survey_dir, max_bytes)
+    return LOG_CACHE
+
+def fetch_opendtect_well_log(well_name, log_name, cache=None):
     """
     Fetches a well log.
     
+    Served by cache (or LOG_CACHE, see enable_log_cache) when available.
+    
     ARGUMENTS
     ---------
         well_name : str
@@ -30,6 +246,9 @@ def fetch_opendtect_well_log(well_name, log_name):
             
         log_name : str
             Log name as reported by wellman.
+            
+        cache : WellLogCache (optional)
+            On-disk log cache. LOG_CACHE by default.
     
     RETURN
     ------
@@ -40,6 +259,21 @@ def fetch_opendtect_well_log(well_name, log_name):
         Empty list
             If there isn't any log by log_name related to well_name.
     
+    """
+    if cache is None:
+        cache = LOG_CACHE
+    with pp.METRICS.span("wellman_fetch", well=well_name, log=log_name):
+        if cache is not None:
+            return cache.get(well_name, log_name)
+        return read_opendtect_well_log(well_name, log_name)
+
+def read_opendtect_well_log(well_name, log_name):
+    """
+    Reads a well log from wellman. See fetch_opendtect_well_log.
+    
+    Returns an empty list only if wellman reports no such well or log 
+    (see wellman_lacks_log); other errors (e.g. IO) are raised, so they 
+    aren't cached as missing logs.
     """
     try:
         # log n array
@@ -49,9 +283,106 @@ def fetch_opendtect_well_log(well_name, log_name):
             log = wm.getLog(well_name, log_name)
         return (log)
     except Exception:
+        if not wellman_lacks_log(well_name, log_name):
+            raise
         print(f"Log {log_name} not found for Well {well_name}.")
         return([])
+
+def wellman_lacks_log(well_name, log_name):
+    """
+    Whether wellman reports no well by well_name, or no log by log_name 
+    for it ("track" is available for every well).
+    """
+    if well_name not in wm.getNames():
+        return True
+    return log_name != "track" and log_name not in wm.getLogNames(well_name)
+    
+def fetch_opendtect_well_logs(
+    well_names, 
+    log_name, 
+    workers=1, 
+    queue_size=None, 
+    executor="thread"
+):
+    """
+    Fetches a well log for many wells using a pool of readers.
+    
+    At most queue_size reads are in flight (or waiting to be consumed) at 
+    any time, so a slow consumer applies backpressure on OPENDTECT reads.
     
+    ARGUMENTS
+    ---------
+        well_names : list
+            Wells' database names.
+            
+        log_name : str
+            Log name as reported by wellman.
+            
+        workers : int
+            Number of concurrent wellman readers. 1 by default (serial).
+            
+        queue_size : int
+            Maximum number of pending reads. 2 * workers by default.
+            
+        executor : str
+            "thread" (default) or "process" pool. Spans recorded by the 
+            reader processes (see pp.Metrics) are sent back with each log
+            and recorded in this process.
+    
+    RETURN
+    ------
+        Generator of tuples (well_name, log)
+            Logs as returned by fetch_opendtect_well_log, in completion
+            order.
+    """
+    if workers <= 1:
+        for well_name in well_names:
+            yield well_name, fetch_opendtect_well_log(well_name, log_name)
+        return
+    if queue_size is None:
+        queue_size = 2 * workers
+    if executor == "process":
+        pool_class = ProcessPoolExecutor
+        fetch = partial(fetch_log_with_spans, log_name=log_name)
+    else:
+        pool_class = ThreadPoolExecutor
+        fetch = partial(fetch_opendtect_well_log, log_name=log_name)
+
+    def result(future):
+        if executor != "process":
+            return future.result()
+        log, spans = future.result()
+        for stage, labels, elapsed in spans:
+            pp.METRICS.record(stage, elapsed, **labels)
+        return log
+
+    with pool_class(max_workers=workers) as pool:
+        pending = {}
+        for well_name in well_names:
+            pending[pool.submit(fetch, well_name)] = well_name
+            if len(pending) < max(queue_size, workers):
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), result(future)
+        for future in list(pending):
+            yield pending.pop(future), result(future)
+
+def fetch_log_with_spans(well_name, log_name):
+    """
+    fetch_opendtect_well_log for reader processes: also returns the spans
+    recorded meanwhile, a list of (stage, labels, elapsed), since the 
+    child's pp.METRICS never reaches the parent.
+    """
+    spans = []
+    hook = lambda stage, labels, elapsed: spans.append((stage, labels, elapsed))
+    pp.METRICS.hooks.append(hook)
+    try:
+        log = fetch_opendtect_well_log(well_name, log_name)
+    finally:
+        pp.METRICS.hooks.remove(hook)
+    return log, spans
+
 def insert_log_as_arrays_query(
     well_name, 
     log_name,
@@ -97,18 +428,63 @@ def insert_log_as_arrays_query(
          The construction of the PSQL can be improved.
             
     """
-    def array_check(array): return(
-        str(
-            [None if sample == 1e+30 else sample for sample in array]
-        ).replace("None", "Null")
-    )
     # column names & fetch log
     column_names = pp.fetch_column_names(table_name, connection)
     try:
         log = fetch_opendtect_well_log(well_name, log_name)
     except:
         print(f"Can not find well's {well_name} '{log_name}' log in Opendtect internal database")
+    column_types = pp.fetch_column_types(table_name, connection)
+    return log_as_arrays_query(
+        well_name, log_name, log, table_name, column_names, on_conflict_do, column_types
+    )
+
+def log_as_arrays_query(
+    well_name, 
+    log_name,
+    log,
+    table_name, 
+    column_names,
+    on_conflict_do="NOTHING",
+    column_types=None
+):
+    """
+    Creates a query to insert an already fetched log as PSQL arrays.
+    
+    Query builder behind insert_log_as_arrays_query. Doesn't touch 
+    OPENDTECT nor the PSQL server.
+    
+    ARGUMENTS
+    ---------
+        well_name : str
+            Well's database name.
         
+        log_name : str
+            Log name as reported by wellman.
+            
+        log : tuple
+            Arrays returned by fetch_opendtect_well_log.
+            
+        table_name : str
+            PSQL table target.
+            
+        column_names : list
+            Target table's columns.
+            
+        on_conflict_do : str
+            PSQL statements for data updates. (DO) NOTHING by default.
+            
+        column_types : list (optional)
+            Target table's column types (see pp.fetch_column_types). Needed
+            for bytea encoded tables.
+    
+    RETURNS
+    -------
+        str
+            Log insertion Query.
+    """
+    if column_types is None:
+        column_types = [None] * len(column_names)
     # PSQL statements
     insert_statement = f"INSERT INTO {table_name}({pp.string_replacement(column_names)})"
     values_statement = f"VALUES ('{well_name}', "
@@ -116,8 +492,9 @@ def insert_log_as_arrays_query(
     conflict_statement += f"{on_conflict_do};"
     # If log is not []
     if log:
-        for array in log:
-            values_statement += f"array{array_check(array)}, "
+        with pp.METRICS.span("serialize", well=well_name, log=log_name):
+            for array, column_type in zip(log, column_types[1:]):
+                values_statement += f"{pp.log_column_literal(array, column_type)}, "
         values_statement += f"'{log_name}') "           
     # If log [], fill the psql array with nulls
     else:
@@ -132,6 +509,498 @@ def insert_log_as_arrays_query(
     # well insertion message
     return (insert_query)
 
+def log_copy_row(
+    well_name, 
+    log_name, 
+    log, 
+    column_names, 
+    copy_format="text", 
+    column_types=None
+):
+    """
+    Creates a COPY text format row with a single log stored as PSQL arrays.
+    
+    Mirrors insert_log_as_arrays_query: if there is no log, null values
+    will be written for every array column.
+    
+    ARGUMENTS
+    ---------
+        well_name : str
+            Well's database name.
+        
+        log_name : str
+            Log name as reported by wellman.
+            
+        log : tuple
+            Arrays returned by fetch_opendtect_well_log.
+            
+        column_names : list
+            Target table's columns.
+            
+        copy_format : str
+            "text" (default) or "binary".
+            
+        column_types : list (optional)
+            Target table's column types (see pp.fetch_column_types).
+    
+    RETURNS
+    -------
+        str
+            Tab separated and newline terminated COPY row.
+            
+        bytes
+            Binary COPY tuple if copy_format is "binary".
+    """
+    if column_types is None:
+        column_types = [None] * len(column_names)
+    if copy_format == "binary":
+        values = [well_name]
+        if log:
+            values += [
+                pp.log_column_binary(array, column_type) 
+                for array, column_type in zip(log, column_types[1:])
+            ]
+            values += [log_name]
+        else:
+            values += [None] * (len(column_names) - 1)
+        return pp.copy_binary_row(values)
+    values = [pp.copy_text_escape(well_name)]
+    if log:
+        values += [
+            pp.log_column_literal(array, column_type, copy=True) 
+            for array, column_type in zip(log, column_types[1:])
+        ]
+        values += [pp.copy_text_escape(log_name)]
+    else:
+        values += [pp.copy_text_escape(None)] * (len(column_names) - 1)
+    return "\t".join(values) + "\n"
+
+def copy_log_rows(
+    well_names, 
+    log_name, 
+    column_names, 
+    copy_format="text", 
+    read_workers=1, 
+    queue_size=None,
+    column_types=None,
+    executor="thread"
+):
+    """
+    Generator of COPY rows for a single log across many wells.
+    
+    ARGUMENTS
+    ---------
+        well_names : list
+            Wells' database names.
+        
+        log_name : str
+            Log name as reported by wellman.
+            
+        column_names : list
+            Target table's columns.
+            
+        copy_format : str
+            "text" (default) or "binary".
+            
+        read_workers, queue_size : int
+            See fetch_opendtect_well_logs.
+            
+        column_types : list (optional)
+            Target table's column types (see pp.fetch_column_types).
+            
+        executor : str
+            "thread" (default) or "process" reader pool.
+    
+    RETURNS
+    -------
+        Generator of str (or bytes)
+            One COPY row per well. See log_copy_row.
+    """
+    fetched_logs = fetch_opendtect_well_logs(
+        well_names, log_name, read_workers, queue_size, executor
+    )
+    for well_name, log in fetched_logs:
+        with pp.METRICS.span("serialize", well=well_name, log=log_name):
+            row = log_copy_row(well_name, log_name, log, column_names, copy_format, column_types)
+        yield row
+
+def sample_copy_rows(
+    well_names, 
+    log_name, 
+    column_names, 
+    read_workers=1, 
+    queue_size=None,
+    executor="thread"
+):
+    """
+    Generator of COPY csv chunks with a log in long format: one row per 
+    sample (well, md, values...).
+    
+    Wells are serialized one at a time with Pandas' csv writer, so a well 
+    is never materialized as a SQL string. Undefined samples are written 
+    as NULL; wells without log are skipped.
+    
+    ARGUMENTS
+    ---------
+        well_names : list
+            Wells' database names.
+        
+        log_name : str
+            Log name as reported by wellman.
+            
+        column_names : list
+            Target table's columns: well, md and one column per extra
+            wellman array.
+            
+        read_workers, queue_size : int
+            See fetch_opendtect_well_logs.
+            
+        executor : str
+            "thread" (default) or "process" reader pool.
+    
+    RETURNS
+    -------
+        Generator of str
+            One csv chunk per well.
+    """
+    fetched_logs = fetch_opendtect_well_logs(
+        well_names, log_name, read_workers, queue_size, executor
+    )
+    for well_name, log in fetched_logs:
+        if not log:
+            continue
+        samples_df = pd.DataFrame({
+            col_name: pp.encode_log_array(array) 
+            for col_name, array in zip(column_names[1:], log)
+        })
+        # samples without depth can't be indexed
+        samples_df = samples_df[samples_df[column_names[1]].notna()]
+        samples_df.insert(0, column_names[0], well_name)
+        yield samples_df.to_csv(header=False, index=False, na_rep="", float_format="%.17g")
+
+def insert_log_by_samples(
+    well_names, 
+    log_name,
+    table_name, 
+    connection,
+    on_conflict_do="NOTHING",
+    build_index_after=False,
+    read_workers=1,
+    queue_size=None,
+    executor="thread"
+):
+    """
+    Inserts a log into a long format table (see pp.samples_table_creation)
+    through a single streaming COPY.
+    
+    Wells already in the table are skipped if on_conflict_do is NOTHING,
+    otherwise their samples are deleted and rewritten in the same 
+    transaction.
+    
+    ARGUMENTS
+    ---------
+        well_names : list
+            Wells' database names.
+        
+        log_name : str
+            Log name as reported by wellman.
+            
+        table_name : str
+            PSQL long format table target.
+        
+        connection : psycopg2.extensions.connection or pp.ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+            
+        on_conflict_do : str
+            NOTHING (default) skips wells already loaded. Anything else 
+            replaces them.
+            
+        build_index_after : bool
+            Drops the (well, md) index before loading and builds it again 
+            afterwards, in the same transaction. False by default.
+            
+        read_workers, queue_size : int
+            See fetch_opendtect_well_logs.
+            
+        executor : str
+            "thread" (default) or "process" reader pool.
+    
+    RETURNS
+    -------
+        int
+            Number of copied samples.
+    """
+    column_names = pp.fetch_column_names(table_name, connection)
+    well_names = list(well_names)
+    pre_statements = []
+    post_statements = []
+    well_list = ", ".join(pp.sql_literal(well_name) for well_name in well_names)
+    if on_conflict_do.strip().upper() == "NOTHING" and well_names:
+        # one (well, md) index probe per requested well instead of a table scan
+        loaded_wells_query = f"""
+            SELECT requested.well_name
+            FROM UNNEST(array[{well_list}]::text[]) AS requested(well_name)
+            WHERE EXISTS (
+                SELECT 1 FROM {table_name} 
+                WHERE {table_name}.{column_names[0]} = requested.well_name
+            )
+        """
+        loaded_wells = {row[0] for row in pp.fetch_psql_command(loaded_wells_query, connection)[1]}
+        well_names = [well_name for well_name in well_names if well_name not in loaded_wells]
+    elif well_names:
+        pre_statements += [f"DELETE FROM {table_name} WHERE {column_names[0]} IN ({well_list})"]
+    if build_index_after:
+        pre_statements += [pp.samples_index_query(table_name, column_names[0], column_names[1], drop=True)]
+        post_statements += [pp.samples_index_query(table_name, column_names[0], column_names[1])]
+    copy_rows = sample_copy_rows(
+        well_names, log_name, column_names, read_workers, queue_size, executor
+    )
+    return pp.copy_psql_command(
+        copy_rows,
+        table_name,
+        column_names,
+        connection,
+        copy_format="csv",
+        staging=False,
+        pre_statements=pre_statements,
+        post_statements=post_statements
+    )
+
+def insert_logs_pipeline(
+    well_names, 
+    log_name,
+    table_name, 
+    connection,
+    on_conflict_do="NOTHING",
+    read_workers=1,
+    writer_connections=None,
+    queue_size=None,
+    executor="thread",
+    write_workers=None
+):
+    """
+    Inserts logs into a PSQL table overlapping OPENDTECT reads and PSQL 
+    writes.
+    
+    A pool of readers fetches the logs (see fetch_opendtect_well_logs) and 
+    builds the insertion queries, which are put into a bounded queue. One 
+    writer thread per connection drains the queue.
+    
+    ARGUMENTS
+    ---------
+        well_names : list
+            Wells' database names.
+        
+        log_name : str
+            Log name as reported by wellman.
+            
+        table_name : str
+            PSQL table target.
+        
+        connection : psycopg2.extensions.connection or pp.ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+            
+        on_conflict_do : str
+            PSQL statements for data updates. (DO) NOTHING by default.
+            
+        read_workers : int
+            Number of concurrent wellman readers.
+            
+        writer_connections : list (optional)
+            Extra psycopg2 connections. Each one gets its own writer. Not 
+            used with a pp.ConnectionPool.
+            
+        queue_size : int
+            Maximum number of queries waiting for a writer. 
+            2 * read_workers by default.
+            
+        executor : str
+            "thread" (default) or "process" reader pool.
+            
+        write_workers : int
+            Number of writer threads. One per connection by default (maxconn
+            with a pp.ConnectionPool, where each writer checks out its own 
+            connection). A connection is never shared between writers, so
+            it cannot exceed the number of connections.
+    
+    RETURN
+    ------
+        list of pp.CommandResult
+            One per written well, in completion order (see 
+            pp.execute_psql_batch). The first writer error outside the 
+            wells' statements (e.g. a lost connection), if any, is raised
+            once every writer has stopped.
+    """
+    if queue_size is None:
+        queue_size = 2 * max(read_workers, 1)
+    column_names = pp.fetch_column_names(table_name, connection)
+    column_types = pp.fetch_column_types(table_name, connection)
+    if isinstance(connection, pp.ConnectionPool):
+        if writer_connections:
+            raise ValueError("writer_connections cannot be combined with a ConnectionPool")
+        connections = [connection] * connection.maxconn
+    else:
+        connections = [connection] + list(writer_connections or [])
+    if write_workers is None:
+        write_workers = len(connections)
+    if write_workers > len(connections):
+        # a rollback on a shared connection would discard another writer's rows
+        raise ValueError(
+            f"write_workers ({write_workers}) exceeds the number of connections ({len(connections)})"
+        )
+    query_queue = queue.Queue(maxsize=queue_size)
+    results = []
+    writer_errors = []
+    stop = threading.Event()
+    
+    def writer(writer_connection):
+        try:
+            # a pooled writer keeps the same checked out connection until the end
+            with pp.psql_connection(writer_connection) as own_connection:
+                while not stop.is_set():
+                    try:
+                        item = query_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if item is None:
+                        break
+                    well_name, insert_query = item
+                    print(f"\nWell {well_name}")
+                    with pp.METRICS.labels(well=well_name, log=log_name):
+                        results.extend(
+                            pp.execute_psql_batch([(well_name, insert_query)], own_connection, 1)
+                        )
+        except Exception as e:
+            writer_errors.append(e)
+            stop.set()
+
+    def put(item):
+        # a full queue with dead writers would block forever
+        while not stop.is_set():
+            try:
+                query_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if not any(thread.is_alive() for thread in writers):
+                    return False
+        return False
+
+    writers = [
+        threading.Thread(target=writer, args=(connections[index],), daemon=True)
+        for index in range(write_workers)
+    ]
+    for thread in writers:
+        thread.start()
+    fetched_logs = fetch_opendtect_well_logs(
+        well_names, log_name, read_workers, queue_size, executor
+    )
+    try:
+        for well_name, log in fetched_logs:
+            insert_query = log_as_arrays_query(
+                well_name, log_name, log, table_name, column_names, on_conflict_do, column_types
+            )
+            # waits while the queue is full, stops reading if a writer fails
+            if not put((well_name, insert_query)):
+                break
+    except Exception:
+        stop.set()
+        raise
+    finally:
+        fetched_logs.close()
+        for _ in writers:
+            if not put(None):
+                break
+        for thread in writers:
+            thread.join()
+    if writer_errors:
+        raise writer_errors[0]
+    return results
+
+def sync_logs(
+    well_names, 
+    log_name,
+    table_name, 
+    connection,
+    sync_table="log_sync",
+    batch_size=100
+):
+    """
+    Incrementally syncs a log into a PSQL table.
+    
+    A content hash and sample count per (table, well, log) is stored in 
+    sync_table. Wells whose log didn't change since the last sync are
+    skipped; the rest are upserted together with their new hash, under
+    one savepoint per well (see pp.execute_psql_batch).
+    
+    ARGUMENTS
+    ---------
+        well_names : list
+            Wells' database names.
+        
+        log_name : str
+            Log name as reported by wellman.
+            
+        table_name : str
+            PSQL table target.
+        
+        connection : psycopg2.extensions.connection or pp.ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+            
+        sync_table : str
+            PSQL sync metadata table. Created if missing. "log_sync" by 
+            default.
+            
+        batch_size : int
+            Wells per transaction. 100 by default.
+    
+    RETURN
+    ------
+        dict
+            changed, unchanged and failed well names, and results: 
+            pp.CommandResult per written (changed or failed) well.
+    """
+    pp.sync_table_creation(sync_table, connection)
+    column_names = pp.fetch_column_names(table_name, connection)
+    column_types = pp.fetch_column_types(table_name, connection)
+    on_conflict_do = pp.on_conflict_update(column_names)
+    synced_hashes_query = f"""
+        SELECT well_name, content_hash
+        FROM {sync_table}
+        WHERE table_name = '{table_name}' AND log_name = '{log_name}'
+    """
+    synced_hashes = dict(pp.fetch_psql_command(synced_hashes_query, connection)[1])
+    unchanged_wells = []
+
+    def changed_queries():
+        for well_name, log in fetch_opendtect_well_logs(well_names, log_name):
+            content_hash, sample_count = pp.log_content_hash(log)
+            if synced_hashes.get(well_name) == content_hash:
+                unchanged_wells.append(well_name)
+                continue
+            sync_query = f"""
+                INSERT INTO {sync_table}(table_name, well_name, log_name, content_hash, sample_count)
+                VALUES ('{table_name}', '{well_name}', '{log_name}', '{content_hash}', {sample_count})
+                ON CONFLICT (table_name, well_name, log_name) DO UPDATE SET
+                    content_hash = EXCLUDED.content_hash,
+                    sample_count = EXCLUDED.sample_count,
+                    synced_at = now()
+            """
+            insert_query = log_as_arrays_query(
+                well_name, log_name, log, table_name, column_names, on_conflict_do, column_types
+            )
+            yield well_name, [insert_query, sync_query]
+
+    results = pp.execute_psql_batch(changed_queries(), connection, batch_size)
+    return {
+        "changed": [result.key for result in results if result.success],
+        "unchanged": unchanged_wells,
+        "failed": [result.key for result in results if not result.success],
+        "results": results
+    }
+
 def insert_logs(
     well_names, 
     log_name,
@@ -139,37 +1008,365 @@ def insert_logs(
     wells_table, 
     connection,
     mode="array",
-    on_conflict_do="NOTHING"
-
+    on_conflict_do="NOTHING",
+    copy_format="text",
+    read_workers=1,
+    writer_connections=None,
+    queue_size=None,
+    write_workers=None,
+    batch_size=None,
+    build_index_after=False,
+    depth_table=None,
+    executor="thread"
 ):
     """
     Inserts logs into PSQL tables using loops compounded by well names.
       
     For more details, see insert_log_as_arrays_query and insert_log_by_samples docstring.
     
+    MODES
+    -----
+        array
+            One INSERT statement per well, each one under its own 
+            savepoint (see pp.execute_psql_batch). batch_size wells are 
+            committed per transaction (1 by default).
+            
+        copy
+            Every well is streamed through a single COPY ... FROM STDIN
+            into a staging table. on_conflict_do is applied when moving
+            the staged rows into table_name. copy_format selects the COPY
+            "text" (default) or "binary" format.
+            
+        sync
+            Only wells whose log changed since the last sync are upserted.
+            See sync_logs.
+            
+        sample
+            One row per sample in a long format table, streamed through a
+            single COPY. build_index_after rebuilds the (well, md) index 
+            after loading. See insert_log_by_samples.
+    
+    PIPELINE
+    --------
+        read_workers, write_workers, queue_size : int
+            See insert_logs_pipeline. 1 reader by default.
+            
+        writer_connections : list (optional)
+            See insert_logs_pipeline (array mode).
+            
+        executor : str
+            "thread" (default) or "process" reader pool. Processes 
+            sidestep the GIL when wellman reads are CPU bound.
+            
+        In array mode, read_workers > 1 or writer_connections run 
+        insert_logs_pipeline, one transaction per well (batch_size is 
+        rejected with a ValueError). In copy mode, read_workers feed the
+        single COPY stream.
+        
+    DEPTH METADATA
+    --------------
+        depth_table : str (optional)
+            Depth metadata table (see pp.depth_table_creation), updated 
+            for well_names after insertion (array, copy and sync modes).
+            See update_depth_metadata.
+    
+    RETURN
+    ------
+        list of pp.CommandResult
+            array and sync modes: one per written well (key = well name),
+            failed wells with success False and their error. Unchanged 
+            wells aren't written in sync mode (see sync_logs).
+            copy and sample modes: a single result for the COPY 
+            transaction (key = table_name).
+    """
+    # well_names is read again by update_depth_metadata: a generator would be exhausted
+    well_names = list(well_names)
+    pipeline = mode == "array" and (read_workers > 1 or writer_connections or write_workers)
+    if pipeline and batch_size:
+        raise ValueError("batch_size is not supported by insert_logs_pipeline (one transaction per well)")
+    print(f"\nProccessing insertion query. Concept: well log '{log_name}' insertion in {mode} mode")
+    written_wells = well_names
+    if pipeline:
+        results = insert_logs_pipeline(
+            well_names, 
+            log_name, 
+            table_name, 
+            connection, 
+            on_conflict_do, 
+            read_workers=read_workers, 
+            writer_connections=writer_connections, 
+            queue_size=queue_size,
+            executor=executor,
+            write_workers=write_workers
+        )
+    elif mode == "sync":
+        sync_report = sync_logs(
+            well_names, log_name, table_name, connection, batch_size=batch_size or 100
+        )
+        results = sync_report["results"]
+        written_wells = sync_report["changed"]
+    elif mode == "array":
+        column_names = pp.fetch_column_names(table_name, connection)
+        column_types = pp.fetch_column_types(table_name, connection)
+        insert_queries = (
+            (well_name, log_as_arrays_query(
+                well_name, log_name, log, table_name, column_names, on_conflict_do, column_types
+            ))
+            for well_name, log in fetch_opendtect_well_logs(well_names, log_name)
+        )
+        with pp.METRICS.labels(log=log_name):
+            results = pp.execute_psql_batch(insert_queries, connection, batch_size or 1)
+    else:
+        init = time.time()
+        if mode == "sample":
+            copied_rows = insert_log_by_samples(
+                well_names, 
+                log_name, 
+                table_name, 
+                connection, 
+                on_conflict_do, 
+                build_index_after=build_index_after, 
+                read_workers=read_workers, 
+                queue_size=queue_size,
+                executor=executor
+            )
+        elif mode == "copy":
+            column_names = pp.fetch_column_names(table_name, connection)
+            column_types = pp.fetch_column_types(table_name, connection)
+            copy_rows = copy_log_rows(
+                well_names, 
+                log_name, 
+                column_names, 
+                copy_format, 
+                read_workers, 
+                queue_size, 
+                column_types, 
+                executor
+            )
+            staging_columns = None
+            if copy_format == "binary":
+                staging_columns = [f"{column_names[0]} TEXT"]
+                staging_columns += [
+                    f"{col_name} BYTEA" if column_type == "bytea" else f"{col_name} DOUBLE PRECISION[]" 
+                    for col_name, column_type in zip(column_names[1:-1], column_types[1:-1])
+                ]
+                staging_columns += [f"{column_names[-1]} TEXT"]
+            with pp.METRICS.labels(log=log_name):
+                copied_rows = pp.copy_psql_command(
+                    copy_rows, 
+                    table_name, 
+                    column_names, 
+                    connection, 
+                    on_conflict_do, 
+                    copy_format=copy_format, 
+                    staging_columns=staging_columns
+                )
+        else:
+            raise ValueError(f"Unknown mode {mode}: array, copy, sync or sample")
+        # copy_psql_command prints its errors and returns None
+        error = None if copied_rows is not None else "COPY could not be processed"
+        results = [pp.CommandResult(table_name, error is None, error, 0, time.time() - init)]
+    if depth_table is not None and mode != "sample":
+        update_depth_metadata(written_wells, table_name, depth_table, connection)
+    return results
+
+def update_depth_metadata(well_names, table_name, depth_table, connection):
+    """
+    Updates the depth metadata of a log table's wells (first/last md, 
+    sample count and interval, regular sampling, null count).
+    
+    ARGUMENTS
+    ---------
+        well_names : list
+            Wells' database names. None updates every well.
+            
+        table_name : str
+            PSQL log table (well, md, values..., log_name).
+            
+        depth_table : str
+            PSQL depth metadata table (see pp.depth_table_creation).
+        
+        connection : psycopg2.extensions.connection or pp.ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+    
     RETURN
     ------
         str
-            Finalization of the insertion process.
+            pp.execute_psql_command result. None for bytea tables, which
+            have no array metadata.
+    """
+    column_names = pp.fetch_column_names(table_name, connection)
+    column_types = pp.fetch_column_types(table_name, connection)
+    if column_types[1] == "bytea":
+        print(f"Table {table_name} is bytea encoded: depth metadata not updated")
+        return None
+    if well_names is not None and not well_names:
+        return None
+    return pp.execute_psql_command(
+        pp.depth_metadata_query(
+            depth_table, 
+            table_name, 
+            column_names[1], 
+            column_names[2:-1], 
+            well_names=well_names,
+            well_column=column_names[0]
+        ),
+        connection
+    )
+
+async def async_insert_logs(
+    well_names, 
+    log_name,
+    table_name, 
+    wells_table, 
+    connection,
+    on_conflict_do="NOTHING",
+    concurrency=4
+):
+    """
+    Asynchronous insert_logs (array mode): up to concurrency wells are 
+    read, serialized and inserted at once, each well in its own 
+    transaction.
     
-    NOTES
-    -----
-        insert_log_by_samples does not exist (yet)
+    ARGUMENTS
+    ---------
+        concurrency : int
+            Maximum wells in flight. Capped by the pool size when 
+            connection is a pp.ConnectionPool, 1 for a single connection.
+            4 by default.
+            
+        Other arguments: see insert_logs.
+    
+    RETURN
+    ------
+        list
+            pp.execute_psql_command results, in well_names order.
+    """
+    column_names = await pp.run_blocking(pp.fetch_column_names, table_name, connection)
+    column_types = await pp.run_blocking(pp.fetch_column_types, table_name, connection)
+    semaphore = pp.concurrency_limit(connection, concurrency)
+    def well_query(well_name):
+        log = fetch_opendtect_well_log(well_name, log_name)
+        return log_as_arrays_query(
+            well_name, log_name, log, table_name, column_names, on_conflict_do, column_types
+        )
+    def insert_well(well_name):
+        with pp.METRICS.labels(well=well_name, log=log_name):
+            return pp.execute_psql_command(well_query(well_name), connection)
+    return await asyncio.gather(*[
+        pp.run_blocking(insert_well, well_name, semaphore=semaphore) for well_name in well_names
+    ])
+
+def insert_well_logs(
+    well_names, 
+    log_tables,
+    wells_table, 
+    connection,
+    track_table=None,
+    on_conflict_do="NOTHING",
+    batch_size=1
+):
+    """
+    Inserts many logs into their PSQL tables visiting each well once.
+    
+    Every requested log (plus the track, if track_table is given) is 
+    fetched from OPENDTECT in a single pass over the wells, and all the
+    insertion queries of a batch of wells are executed in one transaction.
+    Each well runs under its own savepoint, so a failing well is rolled
+    back alone.
+    
+    ARGUMENTS
+    ---------
+        well_names : list
+            Wells' database names.
+            
+        log_tables : dict
+            Log name (as reported by wellman) -> PSQL table target.
+            e.g. {"Joined Well Logs`GR": "gr_table"}
+            
+        wells_table : str
+            PSQL wells table, where the basic well info is stored.
+        
+        connection : psycopg2.extensions.connection or pp.ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+            
+        track_table : str (optional)
+            PSQL track table. If given, wellman's track is inserted too.
+            
+        on_conflict_do : str or dict
+            PSQL statements for data updates. (DO) NOTHING by default. A
+            dict maps table names to their own statement.
+            
+        batch_size : int
+            Number of wells per transaction. 1 by default.
+    
+    RETURN
+    ------
+        str
+            Finalization of the insertion process: measured fetch and 
+            serialization time per log, and time spent executing the 
+            statements (commits excluded).
     """
     init = time.time()
-    print(f"\nProccessing insertion query. Concept: well log '{log_name}' insertion in {mode} mode")
-    if mode == "array":
+    log_tables = dict(log_tables)
+    print(f"\nProccessing insertion query. Concept: {len(log_tables) + (track_table is not None)} well logs insertion in a single pass")
+    if track_table is not None:
+        log_tables["track"] = track_table
+    column_names = {
+        table_name: pp.fetch_column_names(table_name, connection) 
+        for table_name in log_tables.values()
+    }
+    column_types = {
+        table_name: pp.fetch_column_types(table_name, connection) 
+        for table_name in log_tables.values()
+    }
+    if isinstance(on_conflict_do, str):
+        on_conflict_do = {table_name: on_conflict_do for table_name in log_tables.values()}
+    # per log: fetch & serialization times
+    timings = {log_name: {"fetch": 0.0, "build": 0.0} for log_name in log_tables}
+
+    def well_queries():
         for well_name in well_names:
             print(f"\nWell {well_name}")
-            insert_query = insert_log_as_arrays_query(well_name, log_name, table_name, wells_table, connection, on_conflict_do)
-            pp.execute_psql_command(insert_query, connection)
-    if mode == "sample":
-         for well_name in well_names:
-            print(f"\nWell {well_name}")
-            insert_query = insert_log_by_samples(well_name, log_name, table_name, wells_table, connection, on_conflict_do)
-            pp.execute_psql_command(insert_query, connection)
+            queries = []
+            for log_name, table_name in log_tables.items():
+                init_log = time.time()
+                log = fetch_opendtect_well_log(well_name, log_name)
+                fetched = time.time()
+                queries += [
+                    log_as_arrays_query(
+                        well_name, 
+                        log_name, 
+                        log, 
+                        table_name, 
+                        column_names[table_name], 
+                        on_conflict_do.get(table_name, "NOTHING"),
+                        column_types[table_name]
+                    )
+                ]
+                timings[log_name]["fetch"] += fetched - init_log
+                timings[log_name]["build"] += time.time() - fetched
+            yield well_name, queries
+    
+    # one savepoint per well, batch_size wells per transaction
+    results = pp.execute_psql_batch(well_queries(), connection, batch_size)
+    transactions = results[-1].transaction + 1 if results else 0
+    failed_wells = [result for result in results if not result.success]
     end = time.time()
-    return (f"\nLog '{log_name}' insertion completed in {end - init}s")
+    report = (
+        f"\nWell logs insertion completed in {end - init}s: {len(results)} wells in "
+        f"{transactions} transactions, {sum(result.elapsed for result in results)}s executing statements"
+    )
+    for log_name, log_timings in timings.items():
+        report += (
+            f"\n    Log '{log_name}': fetch {log_timings['fetch']}s, "
+            f"serialization {log_timings['build']}s"
+        )
+    for result in failed_wells:
+        report += f"\n    Well {result.key} rolled back: {result.error}"
+    return report
 
 def update_log_as_arrays_query(
     well_name, 
@@ -179,24 +1376,24 @@ def update_log_as_arrays_query(
     column_names,
     on_conflict_do="NOTHING"
 ):
-    def array_check(array): return(
-        str(
-            [None if sample == 1e+30 else sample for sample in array]
-        ).replace("None", "Null")
-    )
     # fetch log
     try:
         log = fetch_opendtect_well_log(well_name, log_name)
     except:
         print(f"Can not find well's {well_name} '{log_name}' log in Opendtect internal database")
         
+    column_types = dict(zip(
+        pp.fetch_column_names(table_name, connection), 
+        pp.fetch_column_types(table_name, connection)
+    ))
     # PSQL statements
     update_statement = f"UPDATE {table_name} "
     set_statement = "SET "
     column_counter = 0
     if log:
         for array in log:
-            set_statement += f"{column_names[column_counter]} = array{array_check(array)}, "
+            column_type = column_types.get(column_names[column_counter])
+            set_statement += f"{column_names[column_counter]} = {pp.log_column_literal(array, column_type)}, "
             column_counter += 1
         set_statement += f"{column_names[-1]} = '{log_name}' "           
     else:
@@ -213,13 +1410,155 @@ def update_log_as_arrays_query(
     return (update_query)
     
 
+def fetch_log_names_inventory(well_names, workers=8, reload=False):
+    """
+    Fetches the available log names of many wells in parallel.
+    
+    Results are kept in LOG_NAMES_INVENTORY, so wells are only asked to 
+    wellman once per session.
+    
+    ARGUMENTS
+    ---------
+        well_names : list
+            Wells' database names.
+            
+        workers : int
+            Concurrent wellman calls. 8 by default.
+            
+        reload : bool
+            Ignores the cached inventory. False by default.
+    
+    RETURN
+    ------
+        dict
+            Well name -> list of log names.
+    """
+    def log_names(well_name):
+        try:
+            return wm.getLogNames(well_name) or []
+        except Exception:
+            return []
+    missing_wells = [
+        well_name for well_name in well_names 
+        if reload or well_name not in LOG_NAMES_INVENTORY
+    ]
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        for well_name, names in zip(missing_wells, pool.map(log_names, missing_wells)):
+            LOG_NAMES_INVENTORY[well_name] = list(names)
+    return {well_name: LOG_NAMES_INVENTORY[well_name] for well_name in well_names}
+
+def suggest_log_names(log_name, available_logs, fallback_log_names=None):
+    """
+    Suggests alternative wellman log names for a log column.
+    
+    Preferred fallbacks (if available) come first, then every log whose 
+    name contains log_name as a word (e.g. "gr" matches 
+    "Raw CDA Logs`GR [D]").
+    
+    ARGUMENTS
+    ---------
+        log_name : str
+            Log column name (e.g. "gr").
+            
+        available_logs : list
+            Log names of the well as reported by wellman.
+            
+        fallback_log_names : list (optional)
+            Preferred alternative log names.
+    
+    RETURN
+    ------
+        list
+            Suggested log names, best first.
+    """
+    suggestions = [name for name in fallback_log_names or [] if name in available_logs]
+    for name in available_logs:
+        words = re.split(r"[^0-9a-z]+", name.lower())
+        if log_name.lower() in words and name not in suggestions:
+            suggestions += [name]
+    return suggestions
+
+def null_wells_report(
+    log_name,
+    log_table, 
+    wells_table, 
+    connection, 
+    name_column_name="well_name",
+    fallback_log_names=None,
+    workers=8
+):
+    """
+    Identifies null and empty wells and suggests fallback logs.
+    
+    Null wells are fetched with one query and their log names with one 
+    parallel, cached pass (see fetch_log_names_inventory).
+    
+    ARGUMENTS
+    ---------
+        log_name : str
+            Log column name in log_table.
+        
+        log_table : str
+            PSQL log table target.
+        
+        wells_table : str
+            PSQL wells table, where the basic well info
+            is stored.
+        
+        connection : psycopg2.extensions.connection or pp.ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+        
+        name_column_name : str
+            Well name column in PSQL wells table. Default: well_name.
+            
+        fallback_log_names : list (optional)
+            Preferred alternative log names, e.g. ["Raw CDA Logs`GR [D]"].
+            
+        workers : int
+            Concurrent wellman calls. 8 by default.
+    
+    RETURNS
+    -------
+        dict
+            - null_wells: wells without log_name.
+            - empty_wells: null wells without any log.
+            - available_logs: null well -> log names.
+            - suggestions: null well -> suggested log names.
+            - fallbacks: suggested log name -> wells, ready for a single
+                insert_logs call per fallback.
+    """
+    # Fetch Nulls from 
+    check_nulls_query = f"SELECT {name_column_name} FROM {log_table} "
+    check_nulls_query += f"INNER JOIN {wells_table} "
+    check_nulls_query += f"USING({name_column_name}) WHERE {log_name} is NULL"
+    null_wells_result = pp.fetch_psql_command(check_nulls_query, connection)
+    null_wells = [well[0] for well in null_wells_result[1]]
+    available_logs = fetch_log_names_inventory(null_wells, workers)
+    suggestions = {}
+    fallbacks = {}
+    for well_name in null_wells:
+        suggestions[well_name] = suggest_log_names(
+            log_name, available_logs[well_name], fallback_log_names
+        )
+        if suggestions[well_name]:
+            fallbacks.setdefault(suggestions[well_name][0], []).append(well_name)
+    return {
+        "null_wells": null_wells,
+        "empty_wells": [well_name for well_name in null_wells if not available_logs[well_name]],
+        "available_logs": available_logs,
+        "suggestions": suggestions,
+        "fallbacks": fallbacks
+    }
+
 def check_null_wells(
     log_name,
     log_table, 
     wells_table, 
     connection, 
     verbose=False,
-    name_column_name="well_name" 
+    name_column_name="well_name",
+    workers=8
 ):
     """
     Identifies null and empty wells.
@@ -248,8 +1587,8 @@ def check_null_wells(
         name_column_name : str
             Well name column in PSQL wells table. Default: well_name.
             
-        id_column_name : str
-            Well id column's name. Default: well_id.
+        workers : int
+            Concurrent wellman calls. 8 by default.
     
     RETURNS
     -------
@@ -258,30 +1597,26 @@ def check_null_wells(
             
     FOOT NOTES
     ----------
-         The construction of the PSQL can be improved.
+         See null_wells_report for a structured report with fallback
+         log suggestions.
     
     """
-    
-    # Fetch Nulls from 
-    check_nulls_query = f"SELECT {name_column_name} FROM {log_table} "
-    check_nulls_query += f"INNER JOIN {wells_table} "
-    check_nulls_query += f"USING({name_column_name}) WHERE {log_name} is NULL"
-    null_wells_result = pp.fetch_psql_command(check_nulls_query, connection)
-    # null & empty wells lists
-    null_wells = []
-    empty_wells = []
-    for well in null_wells_result[1]:
-        # list filling
-        null_wells += [well[0]]
-        well_check = wm.getLogNames(well[0])
-        if well_check and verbose:
-            print(f"\nWell '{well[0]}' logs:")
-            print("****************************************")
-            for log_names in well_check:
-                 print(log_names)
-        else:
-            empty_wells += [well[0]]
-    return(null_wells, empty_wells)
+    report = null_wells_report(
+        log_name, 
+        log_table, 
+        wells_table, 
+        connection, 
+        name_column_name=name_column_name, 
+        workers=workers
+    )
+    if verbose:
+        for well_name in report["null_wells"]:
+            if report["available_logs"][well_name]:
+                print(f"\nWell '{well_name}' logs:")
+                print("****************************************")
+                for log_names in report["available_logs"][well_name]:
+                    print(log_names)
+    return(report["null_wells"], report["empty_wells"])
 
 def insert_markers_query(well_name, table_name, on_conflict_do="NOTHING"):
     """
@@ -304,6 +1639,10 @@ def insert_markers_query(well_name, table_name, on_conflict_do="NOTHING"):
     -------
         str
             Marker's insertion Query.
+            
+    FOOT NOTES
+    ----------
+        See insert_markers to load the markers of many wells at once.
     """
     od_markers = wm.getMarkers(well_name)
     #Recover table columns (same as df)
@@ -330,6 +1669,126 @@ def insert_markers_query(well_name, table_name, on_conflict_do="NOTHING"):
 
 
 
+def fetch_opendtect_markers(well_names, workers=8):
+    """
+    Fetches the markers of many wells in parallel.
+    
+    ARGUMENTS
+    ---------
+        well_names : list
+            Wells' database names.
+            
+        workers : int
+            Concurrent wellman calls. 8 by default.
+    
+    RETURN
+    ------
+        dict
+            Well name -> {formatted marker name: depth}, in well_names 
+            order. Marker names are formatted by pp.string_replacement 
+            and lowercased (e.g. "Top Zechstein" -> top_zechstein), as 
+            PSQL folds unquoted column names. Markers that only differ by
+            case keep the first depth.
+    """
+    def markers(well_name):
+        od_markers = wm.getMarkers(well_name)
+        well_markers = {}
+        for marker, depth in zip(od_markers[0], od_markers[1]):
+            well_markers.setdefault(pp.string_replacement(marker).lower(), depth)
+        return well_markers
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        return dict(zip(well_names, pool.map(markers, well_names)))
+
+def insert_markers(
+    well_names, 
+    table_name, 
+    connection, 
+    on_conflict_do="NOTHING", 
+    workers=8,
+    long_format=False
+):
+    """
+    Inserts the markers of many wells through a single COPY.
+    
+    Markers are fetched in parallel (see fetch_opendtect_markers) and the 
+    union of their names is computed once, so every well shares the same
+    column list. In the wide layout (one column per marker, as created in
+    the tutorial), missing marker columns are added to table_name in the
+    same transaction (cached schemas are dropped once it commits). 
+    
+    ARGUMENTS
+    ---------
+        well_names : list
+            Wells' database names.
+            
+        table_name : str
+            PSQL markers table target.
+        
+        connection : psycopg2.extensions.connection or pp.ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+            
+        on_conflict_do : str
+            PSQL statements for data updates. (DO) NOTHING by default.
+            "UPDATE" overwrites every marker column.
+            
+        workers : int
+            Concurrent wellman calls. 8 by default.
+            
+        long_format : bool
+            Writes one (well_name, marker, md) row per marker into a 
+            normalized table (see pp.markers_table_creation). False by 
+            default.
+    
+    RETURNS
+    -------
+        int
+            Number of copied rows.
+    """
+    well_markers = fetch_opendtect_markers(list(well_names), workers)
+    marker_names = []
+    for markers in well_markers.values():
+        marker_names += [marker for marker in markers if marker not in marker_names]
+    pre_statements = []
+    if long_format:
+        column_names = ["well_name", "marker", "md"]
+        conflict_column = "well_name, marker"
+        rows = (
+            f"{pp.copy_text_escape(well_name)}\t{pp.copy_text_escape(marker)}\t{depth}\n"
+            for well_name, markers in well_markers.items()
+            for marker, depth in markers.items()
+        )
+    else:
+        column_names = ["well_name"] + marker_names
+        conflict_column = "well_name"
+        pre_statements += [
+            f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {marker} NUMERIC(7,2)"
+            for marker in marker_names
+        ]
+        rows = (
+            pp.copy_text_escape(well_name) + "".join(
+                f"\t{pp.copy_text_escape(markers.get(marker))}" for marker in marker_names
+            ) + "\n"
+            for well_name, markers in well_markers.items()
+        )
+    if on_conflict_do.strip().upper() == "UPDATE":
+        conflict_count = len(conflict_column.split(","))
+        # without marker columns there is nothing to update
+        if len(column_names) > conflict_count:
+            on_conflict_do = pp.on_conflict_update(column_names, conflict_count)
+        else:
+            on_conflict_do = "NOTHING"
+    return pp.copy_psql_command(
+        rows,
+        table_name,
+        column_names,
+        connection,
+        on_conflict_do=on_conflict_do,
+        conflict_column=conflict_column,
+        pre_statements=pre_statements
+    )
+
+
 # DEPRECATED FUNCTIONS
 def insert_wells(
     name_column_name,
@@ -411,63 +1870,33 @@ def insert_wells(
     return f"Wells insertion completed in {end - init}s"
 
 
-
-### To code
-# def insert_log(
-#     well_name, 
-#     log_name,
-#     table_name, 
-#     connection,
-#     on_conflict_do="NOTHING"
-# ):
-#     """
-#     Insert a single log (of given well) into a table.
-    
-#     If there is no log, null values will be inserted in
-#     the table.
+def main(argv=None):
+    """
+    Command line interface.
     
-#     ARGUMENTS
-#     ---------
-#         well_name : str
-#             Well's database name.
-        
-#         log_name : str
-#             Log name as reported by wellman.
-            
-#         table_name : str
-#             PSQL table target.
-        
-#         connection : psycopg2.extensions.connection
-#             Parameters to create a connection between end user and PSQL 
-#             server.
-            
-#         on_conflict_do : str
-#             PSQL statements for data updates. (DO) NOTHING by default.
-    
-#     RETURNS
-#     -------
-#         str
-#             Prints the finalization of the inserting process. Includes
-#             execution time.
-            
-#     FOOT NOTES
-#     ----------
-#          The construction of the PSQL can be improved.
-            
-#     """
-#     init = time.time()
-#     # column names & fetch log
-#     table_columns = pp.fetch_column_names(table_name, connection)
-#     log = fetch_opendtect_well_log(well_name, log_name)
-#     # PSQL statements
-#     insert_statement = f"INSERT INTO {table_name}({pp.string_replacement(table_columns)})"
-#     values_statement = f"VALUES('{well_name}', "
-#     conflict_statement = f"ON CONFLICT (well_name) DO "
-#     conflict_statement += f"{on_conflict_do};"
-#     for sample in range(log[0] + 1):
-#         if log[0][sample] != log[0][-1]:
-#             values_statement += f"{log[0][sample]}, {log[1][sample]}, "
-#         if log[0][sample] == log[0][-1]:
-#             values_statement += f"{log[0][sample]}, {log[1][sample]})"
-#     insertion_query = insert_statement + values_statement + conflict_statement
-#     return insertion_query
\ No newline at end of file
+    warm-cache: fills the on-disk log cache (see WellLogCache), e.g.
+        python opendtect_to_py.py warm-cache --cache-dir cache \
+            --survey-dir /data/F3_Demo "Joined Well Logs`GR" track
+    """
+    parser = argparse.ArgumentParser(prog="opendtect_to_py")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    warm_parser = subparsers.add_parser("warm-cache", help="Fill the on-disk log cache")
+    warm_parser.add_argument("log_names", nargs="+", help="Log names as reported by wellman")
+    warm_parser.add_argument("--cache-dir", required=True)
+    warm_parser.add_argument("--survey-dir", required=True)
+    warm_parser.add_argument("--max-bytes", type=int, default=2 * 1024**3)
+    warm_parser.add_argument("--wells", nargs="*", help="Well names. Every well by default")
+    args = parser.parse_args(argv)
+    if args.command == "warm-cache":
+        init = time.time()
+        cache = WellLogCache(args.cache_dir, args.survey_dir, args.max_bytes)
+        well_names = args.wells or wm.getNames(reload=True)
+        cache.warm(well_names, args.log_names)
+        end = time.time()
+        print(
+            f"Cache warmed in {end - init}s: {cache.misses} logs read, "
+            f"{cache.hits} already cached"
+        )
+
+if __name__ == "__main__":
+    main()
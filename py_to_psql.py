@@ -1,6 +1,22 @@
+import asyncio
+import cProfile
+import hashlib
+import io
+import json
+import pstats
+import re
+import struct
 import sys
+import threading
 import traceback as tb
+import uuid
+import weakref
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from functools import partial
 import psycopg2 as p
+import psycopg2.extras
+import psycopg2.pool
 import time
 import pandas as pd
 import numpy as np
@@ -17,6 +33,361 @@ REPLACE_DICT = {
     "]": ""
 }
 
+COPY_ESCAPE_DICT = {
+    "\\": "\\\\",
+    "\t": "\\t",
+    "\n": "\\n",
+    "\r": "\\r"
+}
+
+# PSQL integer types (information_schema data_type)
+INTEGER_TYPES = {"smallint", "integer", "bigint"}
+
+# OPENDTECT undefined value
+UNDEFINED_VALUE = 1e+30
+
+# PSQL binary COPY framing & float8 type oid
+COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+COPY_BINARY_TRAILER = struct.pack("!h", -1)
+FLOAT8_OID = 701
+
+# NUMERIC and float values (and arrays, NULL elements -> NaN) as Python 
+# floats (see stream_psql_command)
+FLOAT_CASTER = p.extensions.new_type(
+    p.extensions.DECIMAL.values + p.extensions.FLOAT.values,
+    "FLOAT_NAN",
+    lambda value, cursor: np.nan if value is None else float(value)
+)
+FLOAT_ARRAY_CASTER = p.extensions.new_array_type(
+    (1231, 1021, 1022), "FLOAT_NAN_ARRAY", FLOAT_CASTER
+)
+
+# Log arrays storage encodings (see log_table_creation)
+LOG_ENCODINGS = {
+    "numeric": "NUMERIC(13,5)[]",
+    "real": "REAL[]",
+    "double": "DOUBLE PRECISION[]",
+    "bytea": "BYTEA"
+}
+
+# execute_psql_batch result, one per command (or group of commands)
+CommandResult = namedtuple(
+    "CommandResult", ["key", "success", "error", "transaction", "elapsed"]
+)
+
+# Statements that change table definitions (see SchemaCache)
+DDL_PATTERN = re.compile(r"^\s*(CREATE|ALTER|DROP)\b", re.IGNORECASE)
+
+class Metrics:
+    """
+    Per stage timing spans and histograms.
+    
+    Spans (stage, labels, elapsed) are recorded by the query helpers 
+    ("execute", "commit", "copy", "upsert") and by opendtect_to_py 
+    ("wellman_fetch", "serialize"), labeled with well and log names when 
+    known. A "copy" span excludes the time spent producing the rows it 
+    streams (fetch and serialization, recorded as their own spans). 
+    Spans recorded by "process" reader pools are sent back with the logs
+    and recorded in the parent's METRICS (see 
+    opendtect_to_py.fetch_opendtect_well_logs).
+    
+    ARGUMENTS
+    ---------
+        max_spans : int
+            Most recent spans kept. Histograms keep counting beyond it.
+            100000 by default.
+            
+        enabled : bool
+            Records spans. True by default.
+    
+    ATTRIBUTES
+    ----------
+        hooks : list
+            Callables (stage, labels, elapsed) called on every span, e.g.
+            to feed an external profiler or tracer.
+    """
+    BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+    def __init__(self, max_spans=100000, enabled=True):
+        self.enabled = enabled
+        self.spans = deque(maxlen=max_spans)
+        self.hooks = []
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def labels(self, **labels):
+        """
+        Context manager: labels every span recorded by this thread (e.g. 
+        well="F02-1", log="GR").
+        """
+        previous = getattr(self._local, "labels", {})
+        self._local.labels = dict(previous, **labels)
+        try:
+            yield
+        finally:
+            self._local.labels = previous
+
+    @contextmanager
+    def span(self, stage, **labels):
+        """
+        Context manager: times its block as a stage span.
+        """
+        if not self.enabled:
+            yield
+            return
+        init = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - init, **labels)
+
+    def record(self, stage, elapsed, **labels):
+        """
+        Records a span of elapsed seconds.
+        """
+        labels = dict(getattr(self._local, "labels", {}), **labels)
+        with self._lock:
+            self.spans.append((stage, labels, elapsed))
+            key = (stage, labels.get("log"))
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    "buckets": [0] * len(self.BUCKETS), "count": 0, "sum": 0.0
+                }
+            histogram["count"] += 1
+            histogram["sum"] += elapsed
+            for index, bound in enumerate(self.BUCKETS):
+                if elapsed <= bound:
+                    histogram["buckets"][index] += 1
+        for hook in self.hooks:
+            hook(stage, labels, elapsed)
+
+    def reset(self):
+        with self._lock:
+            self.spans.clear()
+            self._histograms = {}
+
+    def totals(self, by="well"):
+        """
+        Seconds per label value and stage, from the kept spans.
+        
+        RETURN
+        ------
+            dict
+                {label value: {stage: seconds}}, e.g. per well.
+        """
+        totals = {}
+        with self._lock:
+            spans = list(self.spans)
+        for stage, labels, elapsed in spans:
+            stages = totals.setdefault(labels.get(by), {})
+            stages[stage] = stages.get(stage, 0.0) + elapsed
+        return totals
+
+    def histograms(self):
+        """
+        RETURN
+        ------
+            list of dict
+                stage, log, count, sum and cumulative buckets ({upper 
+                bound: count}) per stage and log.
+        """
+        with self._lock:
+            items = sorted(self._histograms.items(), key=lambda item: (item[0][0], item[0][1] or ""))
+            return [
+                {
+                    "stage": stage,
+                    "log": log_name,
+                    "count": histogram["count"],
+                    "sum": histogram["sum"],
+                    "buckets": dict(zip(map(str, self.BUCKETS), histogram["buckets"]))
+                }
+                for (stage, log_name), histogram in items
+            ]
+
+    def to_json(self, path=None):
+        """
+        Exports histograms and per well totals as JSON (written to path if
+        given).
+        """
+        content = json.dumps(
+            {"histograms": self.histograms(), "wells": self.totals("well")}, indent=2
+        )
+        if path is not None:
+            with open(path, "w") as json_file:
+                json_file.write(content)
+        return content
+
+    def to_prometheus(self, prefix="opendtect_psql"):
+        """
+        Exports histograms in Prometheus text exposition format.
+        """
+        name = f"{prefix}_stage_seconds"
+        lines = [
+            f"# HELP {name} Time spent per ingest/query stage.",
+            f"# TYPE {name} histogram"
+        ]
+        for histogram in self.histograms():
+            labels = f'stage="{histogram["stage"]}"'
+            if histogram["log"] is not None:
+                log_label = histogram["log"].replace("\\", "\\\\").replace('"', '\\"')
+                labels += f',log="{log_label}"'
+            for bound, count in histogram["buckets"].items():
+                lines += [f'{name}_bucket{{{labels},le="{bound}"}} {count}']
+            lines += [
+                f'{name}_bucket{{{labels},le="+Inf"}} {histogram["count"]}',
+                f"{name}_sum{{{labels}}} {histogram['sum']}",
+                f"{name}_count{{{labels}}} {histogram['count']}"
+            ]
+        return "\n".join(lines) + "\n"
+
+    @contextmanager
+    def profile(self, path=None, sort="cumulative", limit=30):
+        """
+        Context manager: profiles its block with cProfile. Stats are 
+        dumped to path (pstats format) or printed.
+        """
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            if path is not None:
+                profiler.dump_stats(path)
+            else:
+                pstats.Stats(profiler).sort_stats(sort).print_stats(limit)
+
+# Default instrumentation (see Metrics)
+METRICS = Metrics()
+
+class ConnectionPool:
+    """
+    Bounded, thread safe pool of PSQL connections.
+    
+    Wraps psycopg2's ThreadedConnectionPool. Callers block (instead of 
+    failing) when every connection is checked out, connections are health
+    checked on checkout and broken ones are replaced. Every py_to_psql 
+    helper accepts a ConnectionPool wherever a connection is expected.
+    
+    ARGUMENTS
+    ---------
+        minconn : int
+            Connections opened up front. 1 by default.
+            
+        maxconn : int
+            Pool size. 4 by default.
+            
+        health_check : bool
+            Runs SELECT 1 on checkout. True by default.
+            
+        **connection_kwargs
+            psycopg2.connect arguments (host, database, user, ...).
+    
+    EXAMPLE
+    -------
+        pool = pp.ConnectionPool(maxconn=8, host=..., database=...)
+        pp.fetch_psql_command("SELECT * FROM wells", pool)
+        with pool.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    """
+    def __init__(self, minconn=1, maxconn=4, health_check=True, **connection_kwargs):
+        self._pool = p.pool.ThreadedConnectionPool(minconn, maxconn, **connection_kwargs)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self.health_check = health_check
+        self.maxconn = maxconn
+
+    def _healthy(self, connection):
+        if connection.closed:
+            return False
+        if not self.health_check:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self):
+        """
+        Checks out a healthy connection. Blocks while the pool is exhausted.
+        """
+        self._slots.acquire()
+        try:
+            for _ in range(self.maxconn + 1):
+                connection = self._pool.getconn()
+                if self._healthy(connection):
+                    return connection
+                self._pool.putconn(connection, close=True)
+            raise p.OperationalError("Could not get a healthy connection from the pool")
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, connection, close=False):
+        """
+        Returns a connection to the pool, rolling back any open transaction.
+        """
+        try:
+            if not connection.closed and (
+                connection.get_transaction_status() != p.extensions.TRANSACTION_STATUS_IDLE
+            ):
+                connection.rollback()
+        except Exception:
+            close = True
+        finally:
+            self._pool.putconn(connection, close=close or bool(connection.closed))
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager: checks out a connection and returns it on exit.
+        """
+        connection = self.getconn()
+        try:
+            yield connection
+        finally:
+            self.putconn(connection)
+
+    @contextmanager
+    def cursor(self, commit=True):
+        """
+        Context manager: yields a cursor, commits on success and closes it.
+        """
+        with self.connection() as connection:
+            with connection.cursor() as cursor:
+                yield cursor
+            if commit:
+                connection.commit()
+
+    def closeall(self):
+        """
+        Closes every connection of the pool.
+        """
+        self._pool.closeall()
+
+@contextmanager
+def psql_connection(connection):
+    """
+    Context manager: yields a psycopg2 connection from a connection or a 
+    pool.
+    
+    ARGUMENTS
+    ---------
+        connection : psycopg2.extensions.connection or ConnectionPool
+            Connection (yielded as is) or pool (checked out and returned).
+    """
+    if isinstance(connection, ConnectionPool):
+        with connection.connection() as pooled_connection:
+            yield pooled_connection
+    else:
+        yield connection
+
 def execute_psql_command(command, connection):
     """
     Executes PSQL queries.
@@ -26,90 +397,1328 @@ def execute_psql_command(command, connection):
         command : str
             PSQL queries.
         
+        connection : psycopg2.extensions.connection or ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+    
+    RETURN
+    ------
+        str
+            Prints whether the query could be executed successfully
+            or not. Also includes the query execution time on psql 
+            server.
+    """
+    init = time.time()
+    with psql_connection(connection) as conn:
+        try:
+            # PSQL cursor
+            with conn.cursor() as cursor, METRICS.span("execute"):
+                cursor.execute(command)
+            with METRICS.span("commit"):
+                conn.commit()
+            if DDL_PATTERN.match(command):
+                # other connections (or pools) may have cached the table too
+                SCHEMA_CACHE.invalidate()
+            end = time.time()
+            return(f"Query has been executed successfully in {end - init}s"
+            )
+        except Exception as e:
+            # Terminate connection
+            conn.commit()
+            end = time.time()
+            print("Traceback details: ")
+            details = tb.format_tb(e.__traceback__)
+            print("\n".join(details))
+            print(e.__class__.__name__, ":", e)
+            print(f"Query can not be processed. Execution time = {end - init}s")
+        
+def execute_psql_batch(commands, connection, batch_size=100):
+    """
+    Executes PSQL queries grouping them in transactions of batch_size items.
+    
+    Each item runs inside its own SAVEPOINT: a failing item is rolled back
+    alone and the rest of the batch is still committed. Errors are returned
+    instead of printed.
+    
+    ARGUMENTS
+    ---------
+        commands : iterable
+            PSQL queries. Each item may be a str, a list of str (executed 
+            under the same savepoint, e.g. every table of a well) or a 
+            (key, str/list) tuple. The key (e.g. a well name) is reported
+            back in the results; the item's position is used otherwise.
+        
+        connection : psycopg2.extensions.connection or ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+            
+        batch_size : int
+            Items per transaction. 100 by default.
+    
+    RETURN
+    ------
+        list of CommandResult
+            (key, success, error, transaction, elapsed) per item. error is
+            None on success, otherwise "ExceptionName: message". Errors
+            outside the items (e.g. raised by the commands iterable) roll
+            back the open batch and are raised; earlier batches stay 
+            committed.
+    """
+    results = []
+    transaction = 0
+    ddl = False
+    with psql_connection(connection) as conn:
+        try:
+            with conn.cursor() as cursor:
+                items_in_batch = 0
+                for index, item in enumerate(commands):
+                    if isinstance(item, tuple):
+                        key, statements = item
+                    else:
+                        key, statements = index, item
+                    if isinstance(statements, str):
+                        statements = [statements]
+                    ddl = ddl or any(DDL_PATTERN.match(statement) for statement in statements)
+                    init = time.time()
+                    cursor.execute("SAVEPOINT batch_item")
+                    try:
+                        with METRICS.span("execute", well=key):
+                            for statement in statements:
+                                cursor.execute(statement)
+                        cursor.execute("RELEASE SAVEPOINT batch_item")
+                        results.append(CommandResult(key, True, None, transaction, time.time() - init))
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO SAVEPOINT batch_item")
+                        error = f"{e.__class__.__name__}: {str(e).strip()}"
+                        results.append(CommandResult(key, False, error, transaction, time.time() - init))
+                    items_in_batch += 1
+                    if items_in_batch == batch_size:
+                        with METRICS.span("commit"):
+                            conn.commit()
+                        if ddl:
+                            SCHEMA_CACHE.invalidate()
+                        transaction += 1
+                        items_in_batch = 0
+                with METRICS.span("commit"):
+                    conn.commit()
+        except Exception:
+            # e.g. commands raising while building an item: don't leave a
+            # partial batch for the caller's next commit
+            if not conn.closed:
+                conn.rollback()
+            raise
+    if ddl:
+        SCHEMA_CACHE.invalidate()
+    return results
+
+def wells_table_creation(table_name, connection, column_list=[]):
+    """
+    Creates psql tables based on OPENDTECT wells info.
+    
+    PARANETERS
+    ----------
+        table_name : str
+            PostgreSQL table to create.
+        
         connection : psycopg2.extensions.connection
             Parameters to create a connection between end user and PSQL 
             server.
+            
+        column_list : list (optional)
+            List of PSQL statements for a more flexible table creation.
+    
+    RETURN
+    ------
+        PSQL table. The default table is created using the 
+        following columns:
+            - well_id SERIAL NOT NULL UNIQUE
+            - opendtect_id NUMERIC(10,1) NOT NULL
+            - well_name VARCHAR(30) NOT NULL UNIQUE PRIMARY KEY
+            - x_coordinate NUMERIC(10,2) NOT NULL
+            - y_coordinate NUMERIC(10,2) NOT NULL
+            - status VARCHAR(30) NOT NULL
+    """
+    
+    if len(column_list) != 0:
+        table_creation_query = f"CREATE TABLE {table_name}("
+        for column in column_list:
+            table_creation_query += column
+        table_creation_query += ")"   
+    else:
+        table_creation_query = f"""
+            CREATE TABLE {table_name}(
+                well_id SERIAL NOT NULL UNIQUE,
+                opendtect_id NUMERIC(10,1) NOT NULL,
+                well_name VARCHAR(30) NOT NULL UNIQUE PRIMARY KEY,
+                x_coordinate NUMERIC(10,2) NOT NULL,
+                y_coordinate NUMERIC(10,2) NOT NULL,
+                status VARCHAR(30) NOT NULL
+            )
+            """
+    return(execute_psql_command(table_creation_query, connection))
+
+def sync_table_creation(table_name, connection):
+    """
+    Creates (if missing) the metadata table used by incremental log syncs.
+    
+    PARANETERS
+    ----------
+        table_name : str
+            PostgreSQL table to create.
+        
+        connection : psycopg2.extensions.connection or ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+    
+    RETURN
+    ------
+        PSQL table with the following columns:
+            - table_name VARCHAR(63) NOT NULL
+            - well_name VARCHAR(30) NOT NULL
+            - log_name VARCHAR(60) NOT NULL
+            - content_hash CHAR(64) NOT NULL
+            - sample_count INT NOT NULL
+            - synced_at TIMESTAMP NOT NULL DEFAULT now()
+            - PRIMARY KEY (table_name, well_name, log_name)
+    """
+    table_creation_query = f"""
+        CREATE TABLE IF NOT EXISTS {table_name}(
+            table_name VARCHAR(63) NOT NULL,
+            well_name VARCHAR(30) NOT NULL,
+            log_name VARCHAR(60) NOT NULL,
+            content_hash CHAR(64) NOT NULL,
+            sample_count INT NOT NULL,
+            synced_at TIMESTAMP NOT NULL DEFAULT now(),
+            PRIMARY KEY (table_name, well_name, log_name)
+        )
+        """
+    return(execute_psql_command(table_creation_query, connection))
+
+def samples_table_creation(
+    table_name, 
+    connection, 
+    value_columns=["value"], 
+    well_column="well_name", 
+    md_column="md",
+    create_index=True
+):
+    """
+    Creates (if missing) a long format log table: one row per sample.
+    
+    PARANETERS
+    ----------
+        table_name : str
+            PostgreSQL table to create.
+        
+        connection : psycopg2.extensions.connection or ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+            
+        value_columns : list
+            Log value columns, DOUBLE PRECISION. ["value"] by default 
+            (e.g. ["tvdss", "x", "y"] for tracks).
+            
+        well_column, md_column : str
+            Well name and md columns. "well_name" and "md" by default.
+            
+        create_index : bool
+            Creates the (well, md) index. Set it to False to build it after
+            loading (see samples_index_query). True by default.
+    
+    RETURN
+    ------
+        PSQL table with the following columns:
+            - well_column VARCHAR(30) NOT NULL
+            - md_column DOUBLE PRECISION NOT NULL
+            - value_columns DOUBLE PRECISION
+    """
+    table_creation_query = f"CREATE TABLE IF NOT EXISTS {table_name}("
+    table_creation_query += f"{well_column} VARCHAR(30) NOT NULL, "
+    table_creation_query += f"{md_column} DOUBLE PRECISION NOT NULL"
+    for column in value_columns:
+        table_creation_query += f", {column} DOUBLE PRECISION"
+    table_creation_query += ")"
+    result = execute_psql_command(table_creation_query, connection)
+    if create_index:
+        result = execute_psql_command(
+            samples_index_query(table_name, well_column, md_column), connection
+        )
+    return result
+
+def samples_index_query(table_name, well_column="well_name", md_column="md", drop=False):
+    """
+    Creates a query to build (or drop) the (well, md) index of a long 
+    format log table.
+    
+    RETURN
+    ------
+        str
+            CREATE INDEX IF NOT EXISTS / DROP INDEX IF EXISTS query.
+    """
+    index_name = f"{table_name.replace('.', '_')}_{well_column}_{md_column}_idx"
+    if drop:
+        return f"DROP INDEX IF EXISTS {index_name}"
+    return f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}({well_column}, {md_column})"
+
+def markers_table_creation(
+    table_name, 
+    connection, 
+    wells_table="wells", 
+    marker_name_length=50
+):
+    """
+    Creates (if missing) a normalized markers table: one row per well and
+    marker.
+    
+    The (well_name, marker) primary key serves the per well top/base 
+    lookups, while the (marker, md) index serves lookups of one marker 
+    across all wells. See markers_view_query for the wide layout used by 
+    the slicing queries.
+    
+    PARANETERS
+    ----------
+        table_name : str
+            PostgreSQL table to create.
+        
+        connection : psycopg2.extensions.connection or ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+            
+        wells_table : str
+            PSQL wells table, referenced by well_name. "wells" by default.
+            
+        marker_name_length : int
+            Marker name length. 50 by default.
+    
+    RETURN
+    ------
+        PSQL table with the following columns:
+            - well_name VARCHAR(30) NOT NULL REFERENCES wells_table
+            - marker VARCHAR(marker_name_length) NOT NULL (formatted by
+                string_replacement, e.g. top_zechstein)
+            - md NUMERIC(7,2)
+    """
+    index_name = f"{table_name.replace('.', '_')}_marker_md_idx"
+    table_creation_query = f"""
+        CREATE TABLE IF NOT EXISTS {table_name}(
+            well_name VARCHAR(30) NOT NULL REFERENCES {wells_table}(well_name),
+            marker VARCHAR({marker_name_length}) NOT NULL,
+            md NUMERIC(7,2),
+            PRIMARY KEY (well_name, marker)
+        );
+        CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}(marker, md)
+    """
+    return(execute_psql_command(table_creation_query, connection))
+
+def markers_view_query(view_name, table_name, marker_names):
+    """
+    Creates a query to pivot a normalized markers table (see 
+    markers_table_creation) into a wide view: one row per well and one 
+    column per marker, as expected by slice_unnest_data_query, 
+    slice_unnest_wells_query and unnested_logs_to_df.
+    
+    ARGUMENTS
+    ---------
+        view_name : str
+            PSQL view to create (or replace).
+            
+        table_name : str
+            PSQL normalized markers table.
+            
+        marker_names : list
+            Marker names (columns of the view).
+    
+    RETURN
+    ------
+        str
+            CREATE OR REPLACE VIEW query.
+    """
+    marker_columns = "".join(
+        f",\n            MAX(md) FILTER (WHERE marker = '{marker}') AS {marker}"
+        for marker in (string_replacement(name) for name in marker_names)
+    )
+    return f"""
+        CREATE OR REPLACE VIEW {view_name} AS
+        SELECT 
+            well_name{marker_columns}
+        FROM {table_name}
+        GROUP BY well_name
+    """
+
+def depth_table_creation(table_name, connection):
+    """
+    Creates (if missing) the depth metadata table: one row per well, log 
+    table and md column (see depth_metadata_query).
+    
+    PARANETERS
+    ----------
+        table_name : str
+            PostgreSQL table to create.
+        
+        connection : psycopg2.extensions.connection or ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+    
+    RETURN
+    ------
+        PSQL table with the following columns:
+            - well_name VARCHAR(30) NOT NULL
+            - log_table VARCHAR(63) NOT NULL
+            - md_column VARCHAR(63) NOT NULL
+            - first_md, last_md DOUBLE PRECISION: first and last samples' md
+            - sample_count INTEGER
+            - sample_interval DOUBLE PRECISION: mean md step (NULL for a
+                single sample)
+            - regular BOOLEAN: every md is within a quarter of a step 
+                of first_md + index * sample_interval (TRUE for a single
+                sample)
+            - null_count INTEGER: undefined log samples
+    """
+    table_creation_query = f"""
+        CREATE TABLE IF NOT EXISTS {table_name}(
+            well_name VARCHAR(30) NOT NULL,
+            log_table VARCHAR(63) NOT NULL,
+            md_column VARCHAR(63) NOT NULL,
+            first_md DOUBLE PRECISION,
+            last_md DOUBLE PRECISION,
+            sample_count INTEGER,
+            sample_interval DOUBLE PRECISION,
+            regular BOOLEAN,
+            null_count INTEGER,
+            PRIMARY KEY (well_name, log_table, md_column)
+        )
+    """
+    return(execute_psql_command(table_creation_query, connection))
+
+def depth_metadata_query(
+    depth_table, 
+    target_table, 
+    md_column, 
+    value_columns, 
+    well_names=None,
+    well_column="well_name"
+):
+    """
+    Creates a query that computes the depth metadata of a log table's 
+    wells (see depth_table_creation) and upserts it into depth_table.
+    
+    Run once after ingestion: arrays are read a single time, so slicing 
+    queries can compute subscripts from the metadata afterwards. Array
+    encodings only (bytea logs are sliced client side).
+    
+    ARGUMENTS
+    ---------
+        depth_table : str
+            PSQL depth metadata table.
+            
+        target_table : str
+            PSQL log table (one row per well, samples as arrays).
+            
+        md_column : str
+            md array column.
+            
+        value_columns : list
+            Log array columns, whose NULL samples are counted.
+            
+        well_names : list (optional)
+            Wells to update. Every well by default.
+            
+        well_column : str
+            Well name column. "well_name" by default.
+    
+    RETURN
+    ------
+        str
+            INSERT ... ON CONFLICT DO UPDATE query.
+    """
+    sample_columns = ["md_sample"] + [f"value_{index}" for index in range(len(value_columns))]
+    unnest_arguments = ", ".join(f"target.{column}" for column in [md_column] + list(value_columns))
+    null_count = " + ".join(
+        f"COUNT(*) FILTER (WHERE samples.{column} IS NULL)" for column in sample_columns[1:]
+    ) or "0"
+    well_filter = ""
+    if well_names is not None:
+        well_list = ", ".join(sql_literal(well_name) for well_name in well_names)
+        # an empty IN () is a syntax error
+        well_filter = f"AND target.{well_column} IN ({well_list})" if well_list else "AND FALSE"
+    column_names = [
+        "well_name", "log_table", "md_column", "first_md", "last_md", 
+        "sample_count", "sample_interval", "regular", "null_count"
+    ]
+    return f"""
+    INSERT INTO {depth_table}({string_replacement(str(column_names))})
+    SELECT
+        target.{well_column}, '{target_table}', '{md_column}',
+        stats.first_md, stats.last_md, stats.sample_count, stats.sample_interval,
+        stats.md_nulls = 0 AND COALESCE(
+            stats.sample_interval > 0 AND stats.max_deviation <= 0.25 * stats.sample_interval,
+            stats.sample_count = 1
+        ),
+        stats.null_count
+    FROM 
+        {target_table} AS target
+    CROSS JOIN LATERAL (
+        SELECT
+            bounds.first_md, bounds.last_md, bounds.sample_count, bounds.sample_interval,
+            MAX(abs(
+                samples.md_sample - 
+                (bounds.first_md + (samples.sample_index - 1) * bounds.sample_interval)
+            )) AS max_deviation,
+            COUNT(*) FILTER (WHERE samples.md_sample IS NULL) AS md_nulls,
+            {null_count} AS null_count
+        FROM (
+            SELECT
+                target.{md_column}[1]::float8 AS first_md,
+                target.{md_column}[cardinality(target.{md_column})]::float8 AS last_md,
+                cardinality(target.{md_column}) AS sample_count,
+                (
+                    target.{md_column}[cardinality(target.{md_column})]::float8 - 
+                    target.{md_column}[1]::float8
+                ) / NULLIF(cardinality(target.{md_column}) - 1, 0) AS sample_interval
+        ) AS bounds
+        CROSS JOIN LATERAL UNNEST({unnest_arguments})
+            WITH ORDINALITY AS samples({string_replacement(str(sample_columns))}, sample_index)
+        GROUP BY bounds.first_md, bounds.last_md, bounds.sample_count, bounds.sample_interval
+    ) AS stats
+    WHERE 
+        cardinality(target.{md_column}) > 0 {well_filter}
+    ON CONFLICT (well_name, log_table, md_column) DO {on_conflict_update(column_names, 3)}
+    """
+
+def log_table_creation(
+    table_name, 
+    connection, 
+    value_columns,
+    encoding="real",
+    well_column="well_name",
+    md_column="md_in_m",
+    wells_table="wells",
+    log_name_length=30
+):
+    """
+    Creates log tables (one row per well, samples as arrays) with a 
+    selectable storage encoding.
+    
+    PARANETERS
+    ----------
+        table_name : str
+            PostgreSQL table to create.
+        
+        connection : psycopg2.extensions.connection or ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+            
+        value_columns : list
+            Log value columns (e.g. ["gr"] or ["tvdss_in_m", 
+            "x_coordinate", "y_coordinate"] for tracks).
+            
+        encoding : str
+            Key of LOG_ENCODINGS: "numeric" (NUMERIC(13,5)[], the former
+            layout), "real" (REAL[], default), "double" (DOUBLE 
+            PRECISION[]) or "bytea" (float32 blob).
+            
+        well_column, md_column : str
+            Well name and md columns. "well_name" and "md_in_m" by 
+            default.
+            
+        wells_table : str
+            Referenced wells table. None for no foreign key. "wells" by
+            default.
+            
+        log_name_length : int
+            log_name VARCHAR length. 30 by default.
+    
+    RETURN
+    ------
+        PSQL table with the following columns:
+            - well_column VARCHAR(30) NOT NULL UNIQUE (REFERENCES wells)
+            - md_column encoding
+            - value_columns encoding
+            - log_name VARCHAR(log_name_length)
+    """
+    column_type = LOG_ENCODINGS[encoding]
+    well_definition = f"{well_column} VARCHAR(30) NOT NULL UNIQUE"
+    if wells_table is not None:
+        well_definition += f" REFERENCES {wells_table}({well_column})"
+    column_list = [f"{well_definition},"]
+    for column in [md_column] + list(value_columns):
+        column_list += [f"{column} {column_type},"]
+    column_list += [f"log_name VARCHAR({log_name_length})"]
+    return wells_table_creation(table_name, connection, column_list=column_list)
+
+def fetch_psql_command(command, connection):
+    """
+    Fetches data from remote server.
+    
+    ARGUMENTS
+    ---------
+        command : str
+            PSQL queries.
+        
+        connection : psycopg2.extensions.connection or ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+    
+    RETURN
+    ------
+        Tuple (column_names, query_result)
+            Psycopg2 doesn't returns columns with its fetchall 
+            function; therefore, the tuple contains column_names plus 
+            query results.
+    """
+    init = time.time()
+    with psql_connection(connection) as conn:
+        try:
+            # PSQL cursor
+            with conn.cursor() as cursor, METRICS.span("execute"):
+                cursor.execute(command)
+                query_result = cursor.fetchall()
+                column_names = [col_name[0] for col_name in cursor.description]
+            conn.commit()
+            end = time.time()
+            return (column_names, query_result)
+        except Exception as e:
+            # Terminate connection
+            conn.commit()
+            end = time.time()
+            print("Traceback details: ")
+            details = tb.format_tb(e.__traceback__)
+            print("\n".join(details))
+            print(e.__class__.__name__, ":", e)
+            print(f"Command can not be processed. Execution time = {end - init}s")
+
+def stream_psql_command(command, connection, batch_size=10000, output="tuples"):
+    """
+    Fetches data from remote server in batches.
+    
+    Uses a named (server side) cursor, so only batch_size rows are held in
+    client memory at any time, no matter how big the query result is.
+    
+    ARGUMENTS
+    ---------
+        command : str
+            PSQL query.
+        
+        connection : psycopg2.extensions.connection or ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+            
+        batch_size : int
+            Rows per batch (cursor's itersize / fetchmany size). 10000 by 
+            default.
+            
+        output : str
+            Batch type:
+                - "tuples" (default): tuple (column_names, rows), same as
+                    fetch_psql_command.
+                - "numpy": dict of column name -> numpy.ndarray.
+                - "dataframe": Pandas.DataFrame.
+            NUMERIC and float values (arrays included) are floats in 
+            "numpy" and "dataframe" batches, NULL as NaN, so numeric 
+            columns aren't object arrays.
+    
+    RETURN
+    ------
+        Generator of batches. If the consumer stops early, the cursor is
+        closed and its transaction rolled back.
+    """
+    init = time.time()
+    with psql_connection(connection) as conn:
+        try:
+            # PSQL server side cursor
+            with conn.cursor(name=f"stream_{uuid.uuid4().hex}") as cursor:
+                if output in ("numpy", "dataframe"):
+                    p.extensions.register_type(FLOAT_CASTER, cursor)
+                    p.extensions.register_type(FLOAT_ARRAY_CASTER, cursor)
+                cursor.itersize = batch_size
+                cursor.execute(command)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    column_names = [col_name[0] for col_name in cursor.description]
+                    if output == "dataframe":
+                        yield pd.DataFrame.from_records(rows, columns=column_names)
+                    elif output == "numpy":
+                        # pandas turns NULL floats into NaN instead of object arrays
+                        batch_df = pd.DataFrame.from_records(rows, columns=column_names)
+                        yield {
+                            column_name: batch_df.iloc[:, index].to_numpy() 
+                            for index, column_name in enumerate(column_names)
+                        }
+                    else:
+                        yield (column_names, rows)
+            conn.commit()
+        except Exception as e:
+            # Terminate connection
+            conn.rollback()
+            end = time.time()
+            print("Traceback details: ")
+            details = tb.format_tb(e.__traceback__)
+            print("\n".join(details))
+            print(e.__class__.__name__, ":", e)
+            print(f"Command can not be processed. Execution time = {end - init}s")
+        finally:
+            # generator closed early: the cursor is closed, end its transaction
+            if not conn.closed and (
+                conn.get_transaction_status() != p.extensions.TRANSACTION_STATUS_IDLE
+            ):
+                conn.rollback()
+
+def copy_to_numpy(command, connection, float_columns, categories=None, native=True):
+    """
+    Fetches data from remote server through binary COPY TO into NumPy 
+    arrays, without creating one Python object per value.
+    
+    Float and NUMERIC columns are cast to double precision (NULL -> NaN, 
+    never object arrays) and category columns (e.g. well names) to int4 
+    codes server side, so every binary COPY tuple has the same width and 
+    the whole stream is read as one structured array (np.frombuffer, no 
+    copy).
+    
+    ARGUMENTS
+    ---------
+        command : str
+            PSQL query.
+        
+        connection : psycopg2.extensions.connection or ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+            
+        float_columns : list
+            Numeric columns of the query result.
+            
+        categories : dict (optional)
+            Text column -> list of its possible values (duplicates are 
+            dropped). Values not listed get code -1.
+            
+        native : bool
+            Converts float columns to native byte order (one copy on little
+            endian machines). If False, float columns are big endian views
+            over the COPY buffer. True by default.
+    
+    RETURN
+    ------
+        dict
+            Column name -> numpy.ndarray for float columns, 
+            Pandas.Categorical for category columns. Errors are raised 
+            after rolling back.
+    """
+    categories = {
+        column: pd.unique(pd.Series(values, dtype=object)).tolist() 
+        for column, values in (categories or {}).items()
+    }
+    select_statement = []
+    dtype = [("field_count", ">i2")]
+    for column, values in categories.items():
+        value_list = ", ".join(sql_literal(value) for value in values)
+        select_statement += [
+            f"(COALESCE(array_position(ARRAY[{value_list}]::text[], {column}::text), 0) - 1)::int4"
+        ]
+        dtype += [(f"{column}_length", ">i4"), (column, ">i4")]
+    for column in float_columns:
+        select_statement += [f"COALESCE({column}::float8, 'NaN'::float8)"]
+        dtype += [(f"{column}_length", ">i4"), (column, ">f8")]
+    copy_statement = f"""
+        COPY (
+            SELECT {", ".join(select_statement)} 
+            FROM ({command}) AS copy_query
+        ) TO STDOUT (FORMAT binary)
+    """
+    buffer = io.BytesIO()
+    with psql_connection(connection) as conn:
+        try:
+            with conn.cursor() as cursor:
+                cursor.copy_expert(copy_statement, buffer)
+            conn.commit()
+        except Exception:
+            # Terminate connection
+            conn.rollback()
+            raise
+    data = buffer.getbuffer()
+    header_extension = struct.unpack_from("!i", data, 15)[0]
+    records = np.frombuffer(
+        data[19 + header_extension:len(data) - len(COPY_BINARY_TRAILER)], dtype=np.dtype(dtype)
+    )
+    result = {}
+    for column, values in categories.items():
+        result[column] = pd.Categorical.from_codes(records[column].astype(np.int32), values)
+    for column in float_columns:
+        result[column] = records[column].astype(np.float64) if native else records[column]
+    return result
+
+class IteratorFile(io.IOBase):
+    """
+    Read-only file-like wrapper around an iterator of strings or bytes.
+    
+    Lets psycopg2's copy_expert consume COPY rows lazily, so the whole
+    payload is never held in memory as a single string.
+    
+    ARGUMENTS
+    ---------
+        iterator : iterable
+            Iterable of str chunks (usually one COPY row per chunk).
+            
+        binary : bool
+            True if the iterator yields bytes (binary COPY). False by
+            default.
+    
+    ATTRIBUTES
+    ----------
+        elapsed : float
+            Seconds spent waiting on the iterator (producing the rows).
+    """
+    def __init__(self, iterator, binary=False):
+        self._iterator = iter(iterator)
+        self._buffer = b"" if binary else ""
+        self.elapsed = 0.0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size is None or size < 0 or length < size:
+            init = time.perf_counter()
+            try:
+                chunk = next(self._iterator)
+            except StopIteration:
+                break
+            finally:
+                self.elapsed += time.perf_counter() - init
+            chunks.append(chunk)
+            length += len(chunk)
+        data = self._buffer[:0].join(chunks)
+        if size is None or size < 0:
+            self._buffer = data[:0]
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+def log_content_hash(log):
+    """
+    Hashes a wellman log.
+    
+    ARGUMENTS
+    ---------
+        log : tuple
+            Arrays returned by wellman's getLog / getTrack. An empty log 
+            is hashed too.
+    
+    RETURN
+    ------
+        tuple (str, int)
+            SHA-256 hex digest of the encoded arrays and sample count.
+    """
+    content_hash = hashlib.sha256()
+    sample_count = 0
+    for array in log or []:
+        encoded = encode_log_array(array)
+        sample_count = len(encoded)
+        content_hash.update(struct.pack("!q", len(encoded)))
+        content_hash.update(encoded.tobytes())
+    return content_hash.hexdigest(), sample_count
+
+def on_conflict_update(column_names, conflict_columns=1):
+    """
+    Creates an ON CONFLICT ... DO statement that overwrites every column.
+    
+    ARGUMENTS
+    ---------
+        column_names : list
+            Target table's columns.
+            
+        conflict_columns : int or list
+            Number of leading columns used as conflict target, or their
+            names. 1 by default.
+    
+    RETURN
+    ------
+        str
+            "UPDATE SET col = EXCLUDED.col, ..." statement, to be used as
+            on_conflict_do.
+    """
+    if isinstance(conflict_columns, int):
+        conflict_columns = column_names[:conflict_columns]
+    return "UPDATE SET " + ", ".join(
+        f"{col_name} = EXCLUDED.{col_name}" 
+        for col_name in column_names if col_name not in conflict_columns
+    )
+
+def copy_text_escape(value):
+    """
+    Escapes a single value for PSQL COPY text format.
+    
+    ARGUMENTS
+    ---------
+        value : object
+            Value to escape. None is written as COPY's null marker.
+    
+    RETURN
+    ------
+        str
+            Escaped value.
+    """
+    if value is None:
+        return "\\N"
+    value = str(value)
+    for key, replacement in COPY_ESCAPE_DICT.items():
+        value = value.replace(key, replacement)
+    return value
+
+def encode_log_array(samples, undefined_value=UNDEFINED_VALUE):
+    """
+    Converts a wellman array into a float NumPy array.
+    
+    OPENDTECT's undefined value (and NaN) is masked in a single vectorized
+    step and stored as NaN.
+    
+    ARGUMENTS
+    ---------
+        samples : iterable
+            Log samples as returned by wellman's getLog / getTrack.
+            
+        undefined_value : float
+            OPENDTECT undefined value. UNDEFINED_VALUE by default.
+    
+    RETURN
+    ------
+        numpy.ndarray
+            float64 array. Undefined samples are NaN.
+    """
+    array = np.array(samples, dtype=np.float64)
+    # float32 surveys store 1e30 as 1.0000000150474662e+30
+    undefined = np.isclose(array, undefined_value, rtol=1e-6, atol=0)
+    array[undefined] = np.nan
+    return array
+
+def array_to_psql_literal(array, copy=False, undefined_value=UNDEFINED_VALUE):
+    """
+    Serializes a float array as a PSQL array.
+    
+    Undefined samples are masked with NumPy (np.where) and swapped for 
+    None, far cheaper to format than NaN or 1e30, then the samples are 
+    formatted by Python's list repr and None written as NULL. Building 
+    NumPy unicode arrays is ~2x slower (see 
+    benchmarks/bench_array_encoding.py).
+    
+    ARGUMENTS
+    ---------
+        array : list or numpy.ndarray
+            wellman samples or array as returned by encode_log_array. NaN
+            and OPENDTECT's undefined value are written as NULL.
+            
+        copy : bool
+            False by default, returns an array[...] constructor for
+            queries. If True, returns a '{...}' literal for COPY text 
+            format.
+            
+        undefined_value : float
+            OPENDTECT undefined value. UNDEFINED_VALUE by default.
+    
+    RETURN
+    ------
+        str
+            PSQL array.
+    """
+    array = np.asarray(array, dtype=np.float64)
+    # float32 surveys store 1e30 as 1.0000000150474662e+30; NaN fails < too
+    limit = undefined_value * (1 - 1e-6)
+    samples = np.where(array < limit, array, None).tolist()
+    body = str(samples)[1:-1].replace("None", "NULL")
+    if copy:
+        return "{" + body + "}"
+    if not body:
+        return "'{}'"
+    return f"array[{body}]"
+
+def log_column_literal(samples, column_type=None, copy=False):
+    """
+    Serializes wellman samples for a log column of any encoding.
+    
+    ARGUMENTS
+    ---------
+        samples : iterable
+            Log samples as returned by wellman's getLog / getTrack.
+            
+        column_type : str
+            Column type as reported by SCHEMA_CACHE (e.g. "numeric[]", 
+            "float4[]", "bytea"). None is handled as an array column.
+            
+        copy : bool
+            False by default (query literal). True for COPY text format.
+    
+    RETURN
+    ------
+        str
+            PSQL array, or float32 blob for bytea columns (undefined 
+            samples stored as NaN).
+    """
+    if column_type == "bytea":
+        array = encode_log_array(samples)
+        hex_string = array.astype("<f4").tobytes().hex()
+        if copy:
+            return "\\\\x" + hex_string
+        return f"'\\x{hex_string}'::bytea"
+    return array_to_psql_literal(samples, copy)
+
+def log_column_binary(samples, column_type=None):
+    """
+    Prepares wellman samples for copy_binary_row.
+    
+    RETURN
+    ------
+        bytes
+            float32 blob for bytea columns.
+            
+        numpy.ndarray
+            float8[] array otherwise.
+    """
+    array = encode_log_array(samples)
+    if column_type == "bytea":
+        return array.astype("<f4").tobytes()
+    return array
+
+def decode_log_column(value, column_type=None):
+    """
+    Decodes a fetched log column of any encoding into a float array.
+    
+    ARGUMENTS
+    ---------
+        value : list, memoryview or None
+            Fetched value (PSQL array or bytea blob).
+            
+        column_type : str
+            Column type as reported by SCHEMA_CACHE.
+    
+    RETURN
+    ------
+        numpy.ndarray
+            float64 array. NULL samples are NaN.
+    """
+    if value is None:
+        return np.array([], dtype=np.float64)
+    if column_type == "bytea":
+        return np.frombuffer(value, dtype="<f4").astype(np.float64)
+    return np.array(value, dtype=np.float64)
+
+def array_to_copy_binary(array):
+    """
+    Serializes a float array as a PSQL binary COPY float8[] field.
+    
+    The field includes its own length prefix. NaN is written as NULL.
+    
+    ARGUMENTS
+    ---------
+        array : numpy.ndarray
+            Array as returned by encode_log_array.
+    
+    RETURN
+    ------
+        bytes
+            Binary COPY field.
+    """
+    array = np.asarray(array, dtype=np.float64)
+    nulls = np.isnan(array)
+    # int32 length + float8 value per element, big endian
+    elements = np.empty(len(array), dtype=[("length", ">i4"), ("value", ">f8")])
+    elements["length"] = np.where(nulls, -1, 8)
+    elements["value"] = array
+    element_bytes = elements.view(np.uint8).reshape(len(array), 12)
+    if nulls.any():
+        # null elements carry no value bytes
+        keep = np.ones(element_bytes.shape, dtype=bool)
+        keep[nulls, 4:] = False
+        payload = element_bytes[keep].tobytes()
+    else:
+        payload = element_bytes.tobytes()
+    header = struct.pack(
+        "!iiiii", 1, int(nulls.any()), FLOAT8_OID, len(array), 1
+    )
+    return struct.pack("!i", len(header) + len(payload)) + header + payload
+
+def copy_binary_row(values):
+    """
+    Creates a PSQL binary COPY tuple.
+    
+    ARGUMENTS
+    ---------
+        values : list
+            None (NULL), str (TEXT), bytes (BYTEA) or numpy.ndarray 
+            (float8[]) values.
+    
+    RETURN
+    ------
+        bytes
+            Binary COPY tuple.
+    """
+    fields = [struct.pack("!h", len(values))]
+    for value in values:
+        if value is None:
+            fields.append(struct.pack("!i", -1))
+        elif isinstance(value, np.ndarray):
+            fields.append(array_to_copy_binary(value))
+        elif isinstance(value, (bytes, bytearray)):
+            fields.append(struct.pack("!i", len(value)) + bytes(value))
+        else:
+            encoded = str(value).encode("utf-8")
+            fields.append(struct.pack("!i", len(encoded)) + encoded)
+    return b"".join(fields)
+
+def binary_copy_stream(rows):
+    """
+    Frames binary COPY tuples with the PSQL binary header and trailer.
+    
+    ARGUMENTS
+    ---------
+        rows : iterable
+            Iterable of binary COPY tuples.
     
     RETURN
     ------
-        str
-            Prints whether the query could be executed successfully
-            or not. Also includes the query execution time on psql 
-            server.
+        Generator of bytes
     """
-    try:
-        init = time.time()
-        # PSQL cursor
-        cursor = connection.cursor() 
-        cursor.execute(command)
-        connection.commit()
-        end = time.time()
-        return(f"Query has been executed successfully in {end - init}s"
-        )
-    except Exception as e:
-        # Terminate connection
-        connection.commit()
-        end = time.time()
-        print("Traceback details: ")
-        details = tb.format_tb(e.__traceback__)
-        print("\n".join(details))
-        print(e.__class__.__name__, ":", e)
-        print(f"Query can not be processed. Execution time = {end - init}s")
-        
-def wells_table_creation(table_name, connection, column_list=[]):
+    yield COPY_BINARY_HEADER
+    for row in rows:
+        yield row
+    yield COPY_BINARY_TRAILER
+
+def copy_psql_command(
+    rows,
+    table_name,
+    column_names,
+    connection,
+    on_conflict_do="NOTHING",
+    conflict_column=None,
+    copy_format="text",
+    staging_columns=None,
+    staging=True,
+    pre_statements=None,
+    post_statements=None
+):
     """
-    Creates psql tables based on OPENDTECT wells info.
+    Bulk loads rows into a table through COPY ... FROM STDIN.
     
-    PARANETERS
-    ----------
+    Rows are copied into a temporary staging table (dropped on commit) and
+    then moved to the target table with a single INSERT ... SELECT, so the
+    usual ON CONFLICT behavior of the query builders is preserved.
+    
+    ARGUMENTS
+    ---------
+        rows : iterable
+            Iterable of COPY text format rows (tab separated, newline
+            terminated) or binary COPY tuples (see copy_binary_row).
+            
         table_name : str
-            PostgreSQL table to create.
+            PSQL table target.
+            
+        column_names : list
+            Target table's columns, in the same order as the rows.
         
-        connection : psycopg2.extensions.connection
+        connection : psycopg2.extensions.connection or ConnectionPool
             Parameters to create a connection between end user and PSQL 
             server.
             
-        column_list : list (optional)
-            List of PSQL statements for a more flexible table creation.
+        on_conflict_do : str
+            PSQL statements for data updates. (DO) NOTHING by default.
+            
+        conflict_column : str
+            Conflict target. First column of column_names by default.
+            
+        copy_format : str
+            "text" (default), "csv" or "binary". Binary rows are framed 
+            with COPY_BINARY_HEADER and COPY_BINARY_TRAILER.
+            
+        staging_columns : list (optional)
+            Column definitions of the staging table. By default the
+            staging table is LIKE table_name. Binary COPY needs the exact
+            wire types (e.g. DOUBLE PRECISION[]), which are then cast on
+            insertion into table_name.
+            
+        staging : bool
+            If False, rows are copied straight into table_name (append 
+            only, on_conflict_do is ignored). True by default.
+            
+        pre_statements, post_statements : list (optional)
+            PSQL statements executed in the same transaction before and 
+            after the COPY (e.g. deleting rows, building indexes).
     
     RETURN
     ------
-        PSQL table. The default table is created using the 
-        following columns:
-            - well_id SERIAL NOT NULL UNIQUE
-            - opendtect_id NUMERIC(10,1) NOT NULL
-            - well_name VARCHAR(30) NOT NULL UNIQUE PRIMARY KEY
-            - x_coordinate NUMERIC(10,2) NOT NULL
-            - y_coordinate NUMERIC(10,2) NOT NULL
-            - status VARCHAR(30) NOT NULL
+        int
+            Number of rows copied into the staging table. None if the
+            command could not be processed.
     """
-    
-    if len(column_list) != 0:
-        table_creation_query = f"CREATE TABLE {table_name}("
-        for column in column_list:
-            table_creation_query += column
-        table_creation_query += ")"   
+    if conflict_column is None:
+        conflict_column = column_names[0]
+    columns = string_replacement(str(column_names))
+    staging_table = f"{table_name.replace('.', '_')}_staging"
+    if staging_columns is None:
+        staging_definition = f"LIKE {table_name} INCLUDING DEFAULTS"
     else:
-        table_creation_query = f"""
-            CREATE TABLE {table_name}(
-                well_id SERIAL NOT NULL UNIQUE,
-                opendtect_id NUMERIC(10,1) NOT NULL,
-                well_name VARCHAR(30) NOT NULL UNIQUE PRIMARY KEY,
-                x_coordinate NUMERIC(10,2) NOT NULL,
-                y_coordinate NUMERIC(10,2) NOT NULL,
-                status VARCHAR(30) NOT NULL
+        staging_definition = ", ".join(staging_columns)
+    staging_query = f"""
+        CREATE TEMP TABLE {staging_table}
+        ({staging_definition})
+        ON COMMIT DROP
+    """
+    copy_table = staging_table if staging else table_name
+    copy_statement = f"COPY {copy_table}({columns}) FROM STDIN"
+    if copy_format == "binary":
+        copy_statement += " (FORMAT binary)"
+        rows = binary_copy_stream(rows)
+    elif copy_format == "csv":
+        copy_statement += " (FORMAT csv)"
+    upsert_query = f"""
+        INSERT INTO {table_name}({columns})
+        SELECT DISTINCT ON ({conflict_column}) {columns}
+        FROM {staging_table}
+        ON CONFLICT ({conflict_column}) DO {on_conflict_do}
+    """
+    init = time.time()
+    with psql_connection(connection) as conn:
+        try:
+            # PSQL cursor
+            with conn.cursor() as cursor:
+                for statement in pre_statements or []:
+                    cursor.execute(statement)
+                if staging:
+                    cursor.execute(staging_query)
+                rows_file = IteratorFile(rows, binary=copy_format == "binary")
+                copy_init = time.perf_counter()
+                cursor.copy_expert(copy_statement, rows_file)
+                if METRICS.enabled:
+                    # rows are produced lazily: their fetch and serialization
+                    # are excluded from the copy span
+                    METRICS.record(
+                        "copy", time.perf_counter() - copy_init - rows_file.elapsed
+                    )
+                copied_rows = cursor.rowcount
+                if staging:
+                    with METRICS.span("upsert"):
+                        cursor.execute(upsert_query)
+                for statement in post_statements or []:
+                    cursor.execute(statement)
+            with METRICS.span("commit"):
+                conn.commit()
+            if any(
+                DDL_PATTERN.match(statement) 
+                for statement in (pre_statements or []) + (post_statements or [])
+            ):
+                SCHEMA_CACHE.invalidate()
+            end = time.time()
+            print(
+                f"{copied_rows} rows copied into {table_name} in {end - init}s "
+                f"({copied_rows / max(end - init, 1e-9):.1f} rows/s)"
             )
-            """
-    return(execute_psql_command(table_creation_query, connection))
+            return copied_rows
+        except Exception as e:
+            # Terminate connection
+            conn.rollback()
+            end = time.time()
+            print("Traceback details: ")
+            details = tb.format_tb(e.__traceback__)
+            print("\n".join(details))
+            print(e.__class__.__name__, ":", e)
+            print(f"Copy can not be processed. Execution time = {end - init}s")
 
-def fetch_psql_command(command, connection):
+class SchemaCache:
     """
-    Fetches data from remote server.
+    Per-connection cache of table metadata.
+    
+    Tables are described once from information_schema: column names (in
+    ordinal order), data types, primary key and unique keys. Hits and
+    misses are counted. Entries are held by the connection (or pool) 
+    object itself, so they go away with it. Entries are dropped by 
+    invalidate, which execute_psql_command, execute_psql_batch and 
+    copy_psql_command call for every connection once a DDL statement 
+    is committed.
+    """
+    def __init__(self):
+        # connection -> {table name: schema}
+        self._tables = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, table_name, connection):
+        """
+        Returns the cached table schema, describing it on a miss.
+        
+        ARGUMENTS
+        ---------
+            table_name : str
+                PSQL table object. May be schema qualified.
+            
+            connection : psycopg2.extensions.connection
+                Parameters to create a connection between end user and PSQL 
+                server.
+        
+        RETURN
+        ------
+            dict
+                columns (list), types (dict), primary_key (list) and 
+                unique (list of lists).
+        """
+        key = table_name.lower()
+        with self._lock:
+            tables = self._tables.get(connection, {})
+            if key in tables:
+                self.hits += 1
+                return tables[key]
+            self.misses += 1
+        schema = describe_table(table_name, connection)
+        with self._lock:
+            self._tables.setdefault(connection, {})[key] = schema
+        return schema
+
+    def invalidate(self, connection=None, table_name=None):
+        """
+        Drops cached schemas.
+        
+        ARGUMENTS
+        ---------
+            connection : psycopg2.extensions.connection (optional)
+                Drop only this connection's tables. All by default.
+            
+            table_name : str (optional)
+                Drop only this table. Every table by default.
+        """
+        with self._lock:
+            if connection is None:
+                connections = list(self._tables.keys())
+            else:
+                connections = [connection]
+            for cached_connection in connections:
+                tables = self._tables.get(cached_connection, {})
+                if table_name is None:
+                    tables.clear()
+                else:
+                    tables.pop(table_name.lower(), None)
+
+    def info(self):
+        """
+        Returns hits, misses and number of cached tables.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "tables": sum(len(tables) for tables in self._tables.values())
+            }
+
+def describe_table(table_name, connection):
+    """
+    Fetches a table's metadata from information_schema.
     
     ARGUMENTS
     ---------
-        command : str
-            PSQL queries.
+        table_name : str
+            PSQL table object. May be schema qualified (schema.table).
         
         connection : psycopg2.extensions.connection
             Parameters to create a connection between end user and PSQL 
@@ -117,35 +1726,68 @@ def fetch_psql_command(command, connection):
     
     RETURN
     ------
-        Tuple (column_names, query_result)
-            Psycopg2 doesn't returns columns with its fetchall 
-            function; therefore, the tuple contains column_names plus 
-            query results.
+        dict
+            columns (list), types (dict), primary_key (list) and unique 
+            (list of lists).
+    """
+    if "." in table_name:
+        schema_name, bare_name = table_name.lower().split(".", 1)
+        schema_filter = f"'{schema_name}'"
+    else:
+        bare_name = table_name.lower()
+        schema_filter = "current_schema()"
+    columns_query = f"""
+        SELECT column_name, data_type, udt_name
+        FROM information_schema.columns
+        WHERE table_schema = {schema_filter} AND table_name = '{bare_name}'
+        ORDER BY ordinal_position
+    """
+    keys_query = f"""
+        SELECT tc.constraint_name, tc.constraint_type, kcu.column_name
+        FROM information_schema.table_constraints AS tc
+        INNER JOIN information_schema.key_column_usage AS kcu
+        USING(constraint_schema, constraint_name)
+        WHERE 
+            tc.table_schema = {schema_filter} AND 
+            tc.table_name = '{bare_name}' AND
+            tc.constraint_type IN ('PRIMARY KEY', 'UNIQUE')
+        ORDER BY tc.constraint_name, kcu.ordinal_position
     """
-    try:
-        init = time.time()
-        # PSQL cursor
-        cursor = connection.cursor() 
-        cursor.execute(command)
-        query_result = cursor.fetchall()
-        column_names = [col_name[0] for col_name in cursor.description]
-        connection.commit()
-        end = time.time()
-        return (column_names, query_result)
-    except Exception as e:
-        # Terminate connection
-        connection.commit()
-        end = time.time()
-        print("Traceback details: ")
-        details = tb.format_tb(e.__traceback__)
-        print("\n".join(details))
-        print(e.__class__.__name__, ":", e)
-        print(f"Command can not be processed. Execution time = {end - init}s")
+    columns_result = fetch_psql_command(columns_query, connection)
+    if columns_result and columns_result[1]:
+        columns = [row[0] for row in columns_result[1]]
+        types = {
+            row[0]: row[2][1:] + "[]" if row[1] == "ARRAY" else row[1] 
+            for row in columns_result[1]
+        }
+    else:
+        # Not visible in information_schema (e.g. temp tables): 
+        # fall back to an empty SELECT
+        columns = fetch_psql_command(f"SELECT * FROM {table_name} LIMIT 0", connection)[0]
+        types = {}
+    primary_key = []
+    unique = {}
+    keys_result = fetch_psql_command(keys_query, connection)
+    for constraint_name, constraint_type, column_name in (keys_result or [[], []])[1]:
+        if constraint_type == "PRIMARY KEY":
+            primary_key += [column_name]
+        else:
+            unique.setdefault(constraint_name, []).append(column_name)
+    return {
+        "columns": columns,
+        "types": types,
+        "primary_key": primary_key,
+        "unique": list(unique.values())
+    }
+
+SCHEMA_CACHE = SchemaCache()
 
 def fetch_column_names(table_name, connection, limit=0):
     """
     Fetches only column names of a table.
     
+    Served by SCHEMA_CACHE: the table is described once per connection.
+    
     ARGUMENTS
     ---------
         table_name : str
@@ -156,17 +1798,30 @@ def fetch_column_names(table_name, connection, limit=0):
             server.
             
         limit : int
-            0 by default. Adds a query limit of 0 to return only the 
-            column names.
+            0 by default. If not 0, bypasses the cache and runs a 
+            SELECT ... LIMIT query to return the column names.
+    
+    RETURN
+    ------
+        list
+            Table's column names.
+    """
+    if limit != 0:
+        column_names_query = f"SELECT * FROM {table_name} LIMIT {limit}"
+        return(fetch_psql_command(column_names_query, connection)[0])
+    return SCHEMA_CACHE.get(table_name, connection)["columns"]
+
+def fetch_column_types(table_name, connection):
+    """
+    Fetches column types of a table (served by SCHEMA_CACHE).
     
     RETURN
     ------
-        fetch_psql_command
-            fetch_psql_command function that returns only the table's 
-            column names.
+        list
+            Types (e.g. "numeric[]", "float4[]", "bytea"), in column order.
     """
-    column_names_query = f"SELECT * FROM {table_name} LIMIT {limit}"
-    return(fetch_psql_command(column_names_query, connection)[0])
+    schema = SCHEMA_CACHE.get(table_name, connection)
+    return [schema["types"].get(column) for column in schema["columns"]]
 
 def csv_to_df(file_path, sep=",", feet=True, columns=None, encoding="latin-1"):
     """
@@ -196,21 +1851,158 @@ def csv_to_df(file_path, sep=",", feet=True, columns=None, encoding="latin-1"):
     RETURN
     ------
         Pandas.DataFrame
+        
+    FOOT NOTES
+    ----------
+        The whole file is held in memory. See csv_to_psql for large files.
     """
     df = pd.read_csv(file_path, sep, encoding=encoding)
+    return format_csv_df(df, feet, columns)
+
+def format_csv_df(df, feet=True, columns=None):
+    """
+    Renames columns, fills and rounds numeric columns and converts feet to
+    meters in place (see csv_to_df).
+    
+    RETURN
+    ------
+        Pandas.DataFrame
+    """
     #Reformating columns
     if columns != None:
         df.columns = columns[0]
         #Replace nan for 0.0 in numeric columns to ease psql imports
         df[columns[2]] = df[columns[2]].fillna(float(0))
         df[columns[2]] = np.round(df[columns[2]], 2)
-    #Convert feet into meters
-    if feet:
-        df[columns[3]] *= 0.3048
-
-    # df_nulls = df.replace(to_replace=["*", np.NaN], value=["", ""])
+        #Convert feet into meters
+        if feet:
+            df[columns[3]] *= 0.3048
     return df
 
+def read_csv_chunks(file_path, sep=",", encoding="latin-1", chunk_size=100000, engine=None):
+    """
+    Reads a CSV file as a sequence of DataFrames.
+    
+    ARGUMENTS
+    ---------
+        file_path : str
+            Location of CSV file.
+        
+        sep : str
+            CSV's column separator. ',' by default.
+            
+        encoding : str
+            Encoding format.
+            
+        chunk_size : int
+            Rows per chunk. 100000 by default.
+            
+        engine : str (optional)
+            Pandas parser engine ("c", "python"). "pyarrow" streams 
+            record batches through pyarrow.csv (optional dependency); 
+            chunks then follow pyarrow's block size rather than 
+            chunk_size.
+    
+    RETURN
+    ------
+        Generator of Pandas.DataFrame
+    """
+    if engine == "pyarrow":
+        import pyarrow.csv as pv
+        reader = pv.open_csv(
+            file_path,
+            read_options=pv.ReadOptions(encoding=encoding),
+            parse_options=pv.ParseOptions(delimiter=sep)
+        )
+        for batch in reader:
+            yield batch.to_pandas()
+        return
+    yield from pd.read_csv(
+        file_path, sep=sep, encoding=encoding, chunksize=chunk_size, engine=engine
+    )
+
+def csv_to_psql(
+    file_path,
+    table_name,
+    connection,
+    sep=",",
+    feet=True,
+    columns=None,
+    encoding="latin-1",
+    chunk_size=100000,
+    engine=None,
+    on_conflict_do="NOTHING",
+    conflict_column=None,
+    staging=True
+):
+    """
+    Loads a CSV file into a table chunk by chunk, through a single COPY.
+    
+    Each chunk gets csv_to_df's formatting (see format_csv_df) and is 
+    serialized straight into the COPY stream, so memory is bounded by 
+    chunk_size whatever the file size.
+    
+    ARGUMENTS
+    ---------
+        file_path : str
+            Location of CSV file.
+            
+        table_name : str
+            PSQL table object. Columns in the same order as the CSV.
+            
+        connection : psycopg2.extensions.connection or ConnectionPool
+            Parameters to create a connection between end user and PSQL 
+            server.
+        
+        sep, feet, columns, encoding : 
+            See csv_to_df.
+            
+        chunk_size, engine :
+            See read_csv_chunks.
+            
+        on_conflict_do : str
+            PSQL statements for data updates. (DO) NOTHING by default.
+            "UPDATE" overwrites every column but the conflict target.
+            
+        conflict_column : str
+            Upsert key. First table column by default.
+            
+        staging : bool
+            If False, chunks are copied straight into table_name (append 
+            only, on_conflict_do is ignored). True by default.
+    
+    RETURN
+    ------
+        int
+            Number of copied rows. None if the command could not be 
+            processed.
+    """
+    column_names = fetch_column_names(table_name, connection)
+    column_types = fetch_column_types(table_name, connection)
+    if columns != None:
+        column_names = column_names[:len(columns[0])]
+        column_types = column_types[:len(columns[0])]
+    if conflict_column is None:
+        conflict_column = column_names[0]
+    if on_conflict_do.strip().upper() == "UPDATE":
+        on_conflict_do = on_conflict_update(
+            column_names, [column.strip() for column in conflict_column.split(",")]
+        )
+    def copy_rows():
+        for chunk in read_csv_chunks(file_path, sep, encoding, chunk_size, engine):
+            yield from df_copy_rows(
+                format_csv_df(chunk, feet, columns), len(chunk) or 1, column_types
+            )
+    return copy_psql_command(
+        copy_rows(),
+        table_name,
+        column_names,
+        connection,
+        on_conflict_do=on_conflict_do,
+        conflict_column=conflict_column,
+        staging=staging
+    )
+
 def string_replacement(string, replace_dict=REPLACE_DICT):
     """
     Replaces characters in strings.
@@ -237,6 +2029,87 @@ def string_replacement(string, replace_dict=REPLACE_DICT):
         string = string.replace(key, value)
     return string
 
+def series_to_psql_array(series, column_type=None):
+    """
+    Serializes a DataFrame column as a PSQL array.
+    
+    Numeric, boolean and string columns are formatted by type, missing 
+    values (NaN, None) are written as NULL and strings are quoted, so 
+    values such as "Nannestad" are kept untouched. Elements are formatted
+    from the Python list (missing values as None), which is cheaper than 
+    a NumPy unicode array.
+    
+    ARGUMENTS
+    ---------
+        series : Pandas.Series
+            DataFrame column.
+            
+        column_type : str (optional)
+            Target array type as reported by SCHEMA_CACHE (e.g. 
+            "numeric[]", "varchar[]"). The array is cast to it, which 
+            also types empty and all NULL arrays.
+    
+    RETURN
+    ------
+        str
+            array[...] constructor.
+    """
+    if pd.api.types.is_float_dtype(series):
+        # float64 list: float32 scalars repr as np.float32(...), and only NaN reprs as nan
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan).tolist()
+        body = str(values)[1:-1].replace("nan", "NULL")
+    else:
+        values = series.to_numpy(dtype=object, na_value=None).tolist()
+        if pd.api.types.is_bool_dtype(series):
+            body = ",".join([
+                "NULL" if value is None else "TRUE" if value else "FALSE" for value in values
+            ])
+        elif pd.api.types.is_numeric_dtype(series):
+            body = str(values)[1:-1].replace("None", "NULL")
+        elif values and None not in values:
+            if not isinstance(series.dtype, pd.StringDtype):
+                values = map(str, values)
+            # PSQL text can't hold NUL: quotes are escaped once over the joined values
+            body = "'" + "\0".join(values).replace("'", "''").replace("\0", "','") + "'"
+        else:
+            body = ",".join([
+                "NULL" if value is None else f"""'{str(value).replace("'", "''")}'"""
+                for value in values
+            ])
+    cast = f"::{column_type}" if column_type and column_type.endswith("[]") else ""
+    if not body:
+        return f"'{{}}'{cast}"
+    return f"array[{body}]{cast}"
+
+def df_cols_values(df, well_name, column_types=None):
+    """
+    Serializes a DataFrame as a single VALUES row: the well name followed 
+    by one array per column (see series_to_psql_array).
+    
+    ARGUMENTS
+    ---------
+        df : Pandas.DataFrame
+            Structured data. Pandas DataFrame.
+            
+        well_name : str
+            Well's database name.
+            
+        column_types : list (optional)
+            Array types, one per DataFrame column.
+    
+    RETURN
+    ------
+        str
+            "('well_name', array[...], ...)" row.
+    """
+    if column_types is None:
+        column_types = [None] * len(df.columns)
+    arrays = [
+        series_to_psql_array(df[column], column_type) 
+        for column, column_type in zip(df.columns, column_types)
+    ]
+    return f"({sql_literal(well_name)}, " + ", ".join(arrays) + ")"
+
 def df_cols_to_query(df, table_name, well_name, connection, on_conflict_do="NOTHING"):
     """
     Creates a query to insert DataFrame's columns as PSQL arrays into a given 
@@ -265,65 +2138,279 @@ def df_cols_to_query(df, table_name, well_name, connection, on_conflict_do="NOTH
         str
             Insertion Query.
             
-    NOTES
-    -----
-        Tested with lithostratigraphic dataframe constructed by csv_to_df 
-        method.
+    NOTES
+    -----
+        Tested with lithostratigraphic dataframe constructed by csv_to_df 
+        method. See well_dfs_to_query to insert many wells at once.
+    """
+    return well_dfs_to_query({well_name: df}, table_name, connection, on_conflict_do)
+
+def well_dfs_to_query(well_dfs, table_name, connection, on_conflict_do="NOTHING"):
+    """
+    Creates a single query to insert many wells' DataFrames, columns as 
+    PSQL arrays, into a given table (one row per well).
+    
+    ARGUMENTS
+    ---------
+        well_dfs : dict
+            Well's database name -> DataFrame (e.g. a csv_to_df 
+            DataFrame grouped by well). Same columns for every well.
+        
+        table_name : str
+            PSQL table object.
+            
+        connection : psycopg2.extensions.connection
+            Parameters to create a connection between end user and PSQL 
+            server.
+            
+        on_conflict_do : str
+            PSQL statements for data updates. (DO) NOTHING by default.
+                
+    RETURN
+    ------
+        str
+            Insertion Query.
+    """
+    #Recover table columns (same as df) & array types
+    table_df_columns = fetch_column_names(table_name, connection)
+    column_types = fetch_column_types(table_name, connection)[1:]
+    #PSQL statements
+    insert_statement = f"INSERT INTO {table_name}({string_replacement(str(table_df_columns))}) "
+    values_statement = "VALUES" + ",\n".join(
+        df_cols_values(df, well_name, column_types) for well_name, df in well_dfs.items()
+    )
+    conflict_statement = f" ON CONFLICT ({table_df_columns[0]}) DO "
+    conflict_statement += f"{on_conflict_do};"
+    insert_query = insert_statement + values_statement + conflict_statement
+    return (insert_query)
+
+def sql_literal(value):
+    """
+    Formats a single value as a PSQL literal. None and NaN are NULL.
+    
+    ARGUMENTS
+    ---------
+        value : object
+            Value to format.
+    
+    RETURN
+    ------
+        str
+            PSQL literal.
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return "NULL"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, (bool, np.bool_)):
+        return "TRUE" if value else "FALSE"
+    return str(value)
+
+def df_null_objects(df):
+    """
+    Converts a DataFrame into Python objects with None instead of NaN.
+    
+    ARGUMENTS
+    ---------
+        df : Pandas.DataFrame
+            Structured data. Pandas DataFrame.
+    
+    RETURN
+    ------
+        Pandas.DataFrame
+            Object DataFrame, ready for psycopg2 adaptation.
+    """
+    return df.astype(object).where(df.notna(), None)
+
+def df_rows_to_query(df, table_name, connection, on_conflict_do="NOTHING"):
+    """
+    Creates a query to insert DataFrame's values as PSQL single data types into a 
+    given table.
+        
+    ARGUMENTS
+    ---------
+        df : Pandas.DataFrame
+            Structured data. Pandas DataFrame.
+        
+        table_name : str
+            PSQL table object.
+                      
+        connection : psycopg2.extensions.connection
+            Parameters to create a connection between end user and PSQL 
+            server.
+            
+        on_conflict_do : str
+            PSQL statements for data updates. (DO) NOTHING by default.
+                
+    RETURN
+    ------
+        str
+            Insertion Query.
+            
+    FOOT NOTES
+    ----------
+        The whole DataFrame becomes a single statement. See df_rows_to_psql
+        for large DataFrames.
     """
     #Recover table columns (same as df)
     table_df_columns = fetch_column_names(table_name, connection)
     #PSQL statements
     insert_statement = f"INSERT INTO {table_name}({string_replacement(str(table_df_columns))}) "
-    values_statement = f"VALUES('{well_name}', "
-    conflict_statement = f"ON CONFLICT ({table_df_columns[0]}) DO "
+    values_statement = "VALUES" + ",".join(
+        "(" + ", ".join(sql_literal(value) for value in values) + ")"
+        for values in df_null_objects(df).itertuples(index=False, name=None)
+    )
+    conflict_statement = f" ON CONFLICT ({table_df_columns[0]}) DO "
     conflict_statement += f"{on_conflict_do};"
-    for column in df.columns:
-        if column != df.columns[-1]:
-            values_statement += f"array{df[column].to_list()}, ".replace("nan", "NULL")
-        if column == df.columns[-1]:
-            values_statement += f"array{df[column].to_list()}) ".replace("nan", "NULL")
     insert_query = insert_statement + values_statement + conflict_statement
     return (insert_query)
 
-def df_rows_to_query(df, table_name, connection, on_conflict_do="NOTHING"):
+def df_copy_rows(df, chunk_size=10000, column_types=None):
     """
-    Creates a query to insert DataFrame's values as PSQL single data types into a 
-    given table.
-        
+    Serializes a DataFrame into COPY text format, chunk by chunk.
+    
+    Each chunk is formatted column-wise (NaN masks and escaping are 
+    vectorized), so only chunk_size rows are held as text at once.
+    
     ARGUMENTS
     ---------
         df : Pandas.DataFrame
             Structured data. Pandas DataFrame.
+            
+        chunk_size : int
+            Rows per chunk. 10000 by default.
+            
+        column_types : list (optional)
+            Target column types (see fetch_column_types), in df column 
+            order. Float columns bound to integer columns are written 
+            without decimals.
+    
+    RETURN
+    ------
+        Generator of str
+            COPY text format chunks (newline terminated rows).
+    """
+    column_types = list(column_types or [])
+    column_types += [None] * (len(df.columns) - len(column_types))
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        rows = None
+        for index, column in enumerate(chunk.columns):
+            values = chunk.iloc[:, index]
+            if column_types[index] in INTEGER_TYPES and pd.api.types.is_float_dtype(values):
+                # NaN upcasts integers to float, and COPY rejects "1.0" as INTEGER
+                text = values.astype("Int64").astype(str)
+            else:
+                text = values.astype(str)
+            if pd.api.types.is_string_dtype(values) or pd.api.types.is_object_dtype(values):
+                for key, replacement in COPY_ESCAPE_DICT.items():
+                    text = text.str.replace(key, replacement, regex=False)
+            text = text.where(values.notna(), "\\N")
+            rows = text if rows is None else rows.str.cat(text, sep="\t")
+        yield "\n".join(rows) + "\n"
+
+def df_rows_to_psql(
+    df, 
+    table_name, 
+    connection, 
+    on_conflict_do="NOTHING", 
+    conflict_column=None,
+    chunk_size=10000,
+    method="copy"
+):
+    """
+    Inserts DataFrame's rows into a given table, chunk by chunk.
+    
+    Client memory is bounded by chunk_size whatever the DataFrame size, 
+    and everything is written in a single transaction.
+    
+    ARGUMENTS
+    ---------
+        df : Pandas.DataFrame
+            Structured data. Pandas DataFrame, same columns order as 
+            table_name.
         
         table_name : str
             PSQL table object.
                       
-        connection : psycopg2.extensions.connection
+        connection : psycopg2.extensions.connection or ConnectionPool
             Parameters to create a connection between end user and PSQL 
             server.
             
         on_conflict_do : str
             PSQL statements for data updates. (DO) NOTHING by default.
+            "UPDATE" overwrites every column but the conflict target.
+            
+        conflict_column : str
+            Upsert key (e.g. "well_name, top_down_hole_depth_m"). First 
+            table column by default.
+            
+        chunk_size : int
+            Rows per chunk. 10000 by default.
+            
+        method : str
+            "copy" (default): streams the chunks through COPY (see 
+            copy_psql_command). "insert": parameterized multi-row INSERTs,
+            one per chunk; duplicated keys within a chunk fail on UPDATE.
                 
     RETURN
     ------
-        str
-            Insertion Query.
+        int
+            Number of rows written. None if the command could not be 
+            processed.
     """
-    #Recover table columns (same as df)
-    table_df_columns = fetch_column_names(table_name, connection)
-    #PSQL statements
-    insert_statement = f"INSERT INTO {table_name}({string_replacement(str(table_df_columns))}) "
-    values_statement = f"VALUES"
-    conflict_statement = f"ON CONFLICT ({table_df_columns[0]}) DO "
-    conflict_statement += f"{on_conflict_do};"
-    for values in df.values:
-        if list(values) != list(df.values[-1]):
-            values_statement += f"({str(list(values))}),".replace("nan", "NULL").replace("[", "").replace("]", "")
-        if list(values) == list(df.values[-1]):
-            values_statement += f"({str(list(values))})".replace("nan", "NULL").replace("[", "").replace("]", "")
-    insert_query = insert_statement + values_statement + conflict_statement
-    return (insert_query)
+    column_names = fetch_column_names(table_name, connection)[:len(df.columns)]
+    column_types = fetch_column_types(table_name, connection)[:len(df.columns)]
+    if conflict_column is None:
+        conflict_column = column_names[0]
+    if on_conflict_do.strip().upper() == "UPDATE":
+        on_conflict_do = on_conflict_update(
+            column_names, [column.strip() for column in conflict_column.split(",")]
+        )
+    if method == "copy":
+        return copy_psql_command(
+            df_copy_rows(df, chunk_size, column_types),
+            table_name,
+            column_names,
+            connection,
+            on_conflict_do=on_conflict_do,
+            conflict_column=conflict_column
+        )
+    insert_query = f"""
+        INSERT INTO {table_name}({string_replacement(str(column_names))}) VALUES %s
+        ON CONFLICT ({conflict_column}) DO {on_conflict_do}
+    """
+    rows = (
+        values
+        for start in range(0, len(df), chunk_size)
+        for values in df_null_objects(df.iloc[start:start + chunk_size]).itertuples(
+            index=False, name=None
+        )
+    )
+    init = time.time()
+    with psql_connection(connection) as conn:
+        try:
+            # PSQL cursor
+            with conn.cursor() as cursor:
+                psycopg2.extras.execute_values(
+                    cursor, insert_query, rows, page_size=chunk_size
+                )
+            conn.commit()
+            end = time.time()
+            print(
+                f"{len(df)} rows inserted into {table_name} in {end - init}s "
+                f"({len(df) / max(end - init, 1e-9):.1f} rows/s)"
+            )
+            return len(df)
+        except Exception as e:
+            # Terminate connection
+            conn.rollback()
+            end = time.time()
+            print("Traceback details: ")
+            details = tb.format_tb(e.__traceback__)
+            print("\n".join(details))
+            print(e.__class__.__name__, ":", e)
+            print(f"Insertion can not be processed. Execution time = {end - init}s")
 
 def slice_unnest_data_query(
     well_name,
@@ -335,7 +2422,10 @@ def slice_unnest_data_query(
     base_marker_name,
     base_marker_depth,
     join_axis="well_name",
-    md_column_name="md"
+    md_column_name="md",
+    slicing="unnest",
+    md_type=None,
+    depth_table=None
 ):
     """
     Creates a query to fetch subvolumes of data from tables with nested 
@@ -382,11 +2472,39 @@ def slice_unnest_data_query(
             Measured depth column name to use as filter by WHERE
             statement. "md" by default.
             
+        slicing : str
+            "unnest" (default): unnests whole arrays, then filters samples
+            by depth. "index": slices the arrays server side between the
+            top and base indexes (see slice_index_query), md arrays must 
+            be sorted.
+            
+        md_type : str (optional)
+            md array type, for index slicing. See slice_index_query.
+            
+        depth_table : str (optional)
+            Depth metadata table (see depth_table_creation). Implies index
+            slicing, see slice_index_query.
+            
     RETURN
     ------
         str
             Fetch Query.  
     """
+    if slicing == "index" or depth_table is not None:
+        return slice_index_query(
+            target_columns,
+            target_table,
+            markers_table,
+            top_marker_depth,
+            base_marker_depth,
+            f"""
+            ({md_column_name}, {top_marker_name}, {base_marker_name}) IS NOT NULL AND
+            target.well_name = '{well_name}'
+            """,
+            join_axis=join_axis,
+            md_type=md_type,
+            depth_table=depth_table
+        )
     
     # Subquery: logs
     target_subquery = f"""
@@ -423,6 +2541,314 @@ def slice_unnest_data_query(
     """
     return filtered_unnested_query
 
+def slice_index_query(
+    target_columns,
+    target_table, 
+    markers_table,
+    top_expression,
+    base_expression,
+    where_statement,
+    join_axis="well_name",
+    unnest=True,
+    md_alias="md",
+    md_type=None,
+    depth_table=None
+):
+    """
+    Creates a query that slices nested samples (arrays) by depth server 
+    side, without unnesting whole arrays.
+    
+    md arrays are sorted, so the top and base indexes are found with 
+    width_bucket (a binary search over the array) and only 
+    array[top_index:base_index] is returned. Server work and transfer size
+    are proportional to the interval rather than to the whole log.
+    
+    ARGUMENTS
+    ---------
+        target_columns : list
+            List of target table's columns to fetch: join axis, md array 
+            and the remaining array columns.
+            
+        target_table : str
+            PSQL target table.
+            
+        markers_table : str
+            PSQL seismic markers table.
+            
+        top_expression : str or float
+            Depth (or markers' column) at the top of the interval.
+            
+        base_expression : str or float
+            Depth (or markers' column) at the base of the interval.
+            
+        where_statement : str
+            PSQL WHERE conditions.
+        
+        join_axis : str
+            Common column to use as join axis by USING statement.
+            "well_name" by default.
+            
+        unnest : bool
+            Unnests the sliced arrays (one row per sample). True by 
+            default; if False, one row per well with sliced arrays.
+            
+        md_alias : str
+            Output name of the md column. "md" by default.
+            
+        md_type : str (optional)
+            md array type (e.g. "float4[]", see fetch_column_types). The 
+            top and base depths are cast to its element type, as 
+            width_bucket needs matching types.
+            
+        depth_table : str (optional)
+            Depth metadata table (see depth_table_creation). Wells whose
+            [first_md, last_md] range doesn't overlap the interval are 
+            skipped, and regularly sampled wells get their top and base 
+            indexes from first_md and sample_interval (checked against 
+            the neighbouring samples only) instead of width_bucket. 
+            Wells without metadata fall back to width_bucket.
+            
+    RETURN
+    ------
+        str
+            Fetch Query.  
+    """
+    md_column = target_columns[1]
+    if md_type is not None and md_type.endswith("[]"):
+        top_expression = f"({top_expression})::{md_type[:-2]}"
+        base_expression = f"({base_expression})::{md_type[:-2]}"
+    bucket = f"width_bucket({top_expression}, target.{md_column})"
+    top_index = f"""
+            CASE 
+                WHEN target.{md_column}[{bucket}] = {top_expression} THEN {bucket}
+                ELSE {bucket} + 1
+            END"""
+    base_index = f"width_bucket({base_expression}, target.{md_column})"
+    depth_joins = ""
+    if depth_table is not None:
+        md = f"target.{md_column}"
+        top_index = f"""
+            CASE
+                WHEN NOT COALESCE(depths.regular, FALSE) THEN {top_index}
+                WHEN {md}[guesses.top_index - 1] >= {top_expression} THEN guesses.top_index - 1
+                WHEN {md}[guesses.top_index] < {top_expression} THEN guesses.top_index + 1
+                ELSE guesses.top_index
+            END"""
+        base_index = f"""
+            CASE
+                WHEN NOT COALESCE(depths.regular, FALSE) THEN {base_index}
+                WHEN {md}[guesses.base_index + 1] <= {base_expression} THEN guesses.base_index + 1
+                WHEN {md}[guesses.base_index] > {base_expression} THEN guesses.base_index - 1
+                ELSE guesses.base_index
+            END"""
+        # single sample wells have no interval: their only sample is the guess
+        depth_joins = f"""
+    LEFT JOIN {depth_table} AS depths ON 
+        depths.well_name = target.{target_columns[0]} AND
+        depths.log_table = '{target_table}' AND
+        depths.md_column = '{md_column}'
+    CROSS JOIN LATERAL (
+        SELECT
+            COALESCE(ceil(
+                ({top_expression} - depths.first_md) / NULLIF(depths.sample_interval, 0)
+            )::int + 1, 1) AS top_index,
+            COALESCE(floor(
+                ({base_expression} - depths.first_md) / NULLIF(depths.sample_interval, 0)
+            )::int + 1, 1) AS base_index
+    ) AS guesses"""
+        where_statement += f"""
+        AND COALESCE(
+            LEAST(depths.first_md, depths.last_md) <= {base_expression} AND
+            GREATEST(depths.first_md, depths.last_md) >= {top_expression},
+            TRUE
+        )"""
+    sliced_columns = [
+        f"target.{column}[bounds.top_index:bounds.base_index]" 
+        for column in target_columns[1:]
+    ]
+    if unnest:
+        sliced_columns = [f"UNNEST({column})" for column in sliced_columns]
+    select_statement = f"{sliced_columns[0]} AS {md_alias}"
+    for column, sliced_column in zip(target_columns[2:], sliced_columns[1:]):
+        select_statement += f", {sliced_column} AS {column}"
+    sliced_query = f"""
+    SELECT 
+        target.{target_columns[0]}, {select_statement}
+    FROM 
+        {target_table} AS target
+    INNER JOIN {markers_table} AS markers USING({join_axis}){depth_joins}
+    CROSS JOIN LATERAL (
+        SELECT {top_index} AS top_index,
+            {base_index} AS base_index
+    ) AS bounds
+    WHERE 
+        {where_statement}
+    """
+    return sliced_query
+
+def slice_unnest_wells_query(
+    well_names,
+    target_columns,
+    target_table, 
+    markers_table,
+    top_marker_name,
+    base_marker_name,
+    join_axis="well_name",
+    md_column_name="md",
+    slicing="unnest",
+    md_type=None,
+    depth_table=None
+):
+    """
+    Creates a single query to fetch subvolumes of data from tables with 
+    nested samples (arrays) for many wells at once, each well filtered by 
+    its own markers.
+    
+    The arrays are unnested WITH ORDINALITY in a lateral join, so samples 
+    keep their array order and the result is sorted by well and sample.
+    
+    ARGUMENTS
+    ---------
+        well_names : list
+            Wells' database names. None fetches every well with markers.
+            
+        target_columns : list
+            List of target table's columns to fetch: join axis, md and 
+            the remaining array columns.
+            
+        target_table : str
+            PSQL target table.
+            
+        markers_table : str
+            PSQL seismic markers table.
+            
+        top_marker_name : str
+            Marker's name at the top of the interval.
+            
+        base_marker_name : str
+            Marker's name at the base of the interval.
+        
+        join_axis : str
+            Common column to use as join axis by USING statement.
+            "well_name" by default.
+            
+        md_column_name : str
+            Measured depth column name to use as filter by WHERE
+            statement. "md" by default.
+            
+        slicing : str
+            "unnest" (default) or "index". See slice_index_query.
+            
+        md_type : str (optional)
+            md array type, for index slicing. See slice_index_query.
+            
+        depth_table : str (optional)
+            Depth metadata table. Implies index slicing, see 
+            slice_index_query.
+            
+    RETURN
+    ------
+        str
+            Fetch Query.  
+    """
+    array_columns = [md_column_name] + [
+        column for column in target_columns[1:] if column != md_column_name
+    ]
+    unnest_arguments = ", ".join(f"target.{column}" for column in array_columns)
+    select_columns = ", ".join(f"unnested.{column}" for column in array_columns)
+    well_filter = ""
+    if well_names is not None:
+        well_list = ", ".join(sql_literal(well_name) for well_name in well_names)
+        # an empty IN () is a syntax error
+        well_filter = f"AND target.{target_columns[0]} IN ({well_list})" if well_list else "AND FALSE"
+    if slicing == "index" or depth_table is not None:
+        sliced_query = slice_index_query(
+            [target_columns[0]] + array_columns,
+            target_table,
+            markers_table,
+            f"markers.{top_marker_name}",
+            f"markers.{base_marker_name}",
+            f"(markers.{top_marker_name}, markers.{base_marker_name}) IS NOT NULL {well_filter}",
+            join_axis=join_axis,
+            md_alias=md_column_name,
+            md_type=md_type,
+            depth_table=depth_table
+        )
+        return sliced_query + f"ORDER BY target.{target_columns[0]}"
+    filtered_unnested_query = f"""
+    SELECT 
+        target.{target_columns[0]}, {select_columns}
+    FROM 
+        {target_table} AS target
+    INNER JOIN {markers_table} AS markers USING({join_axis})
+    CROSS JOIN LATERAL UNNEST({unnest_arguments}) 
+        WITH ORDINALITY AS unnested({string_replacement(str(array_columns))}, sample_index)
+    WHERE 
+        (markers.{top_marker_name}, markers.{base_marker_name}) IS NOT NULL 
+        {well_filter}
+        AND unnested.{md_column_name} BETWEEN markers.{top_marker_name} AND markers.{base_marker_name}
+    ORDER BY target.{target_columns[0]}, unnested.sample_index
+    """
+    return filtered_unnested_query
+
+def blob_logs_to_df(
+    marker_df,
+    well_name_column,
+    md_column,
+    log_name,
+    target_table, 
+    markers_table,
+    connection,
+    join_axis="well_name"
+):
+    """
+    Constructs a Pandas DataFrame with subvolumes of bytea encoded logs 
+    (see log_table_creation).
+    
+    Blobs can't be unnested server side: every well's md and log blobs are
+    fetched with a single query, decoded with NumPy and filtered by the 
+    well's markers client side.
+    
+    ARGUMENTS
+    ---------
+        See unnested_logs_to_df.
+            
+    RETURN
+    ------
+        DataFrame
+            Collection of sampled logs by well.
+    """
+    top_marker_name = marker_df.columns[1]
+    base_marker_name = marker_df.columns[-1]
+    well_list = ", ".join(sql_literal(well_name) for well_name in marker_df[marker_df.columns[0]])
+    if not well_list:
+        return pd.DataFrame(columns=[well_name_column, md_column, log_name])
+    blobs_query = f"""
+    SELECT 
+        target.{well_name_column}, target.{md_column}, target.{log_name},
+        markers.{top_marker_name}, markers.{base_marker_name}
+    FROM 
+        {target_table} AS target
+    INNER JOIN {markers_table} AS markers USING({join_axis})
+    WHERE 
+        (target.{md_column}, markers.{top_marker_name}, markers.{base_marker_name}) IS NOT NULL AND
+        target.{well_name_column} IN ({well_list})
+    ORDER BY target.{well_name_column}
+    """
+    frames = []
+    for well_name, md_blob, log_blob, top, base in fetch_psql_command(blobs_query, connection)[1]:
+        md = decode_log_column(md_blob, "bytea")
+        log = decode_log_column(log_blob, "bytea")
+        interval = (md >= float(top)) & (md <= float(base))
+        frames += [pd.DataFrame({
+            well_name_column: well_name, 
+            md_column: md[interval], 
+            log_name: log[interval]
+        })]
+    if not frames:
+        return pd.DataFrame(columns=[well_name_column, md_column, log_name])
+    return pd.concat(frames, ignore_index=True)
+
 def unnested_logs_to_df(
     marker_df,
     well_name_column,
@@ -432,11 +2858,19 @@ def unnested_logs_to_df(
     markers_table,
     connection,
     join_axis="well_name",
-    round_value=5
+    round_value=5,
+    per_well=False,
+    slicing="unnest",
+    binary=False,
+    depth_table=None
 ):
     """
     Constructs a Pandas DataFrame to store fetched subvolumes of unnested 
-    data from log tables. Done well by well.
+    data from log tables.
+    
+    By default every well in marker_df is fetched with a single query 
+    (see slice_unnest_wells_query). per_well=True runs one query per well
+    (see slice_unnest_data_query).
     
     ARGUMENTS
     ---------
@@ -461,43 +2895,315 @@ def unnested_logs_to_df(
         markers_table : str
             PSQL seismic markers table.
             
-        connection : psycopg2.extensions.connection
+        connection : psycopg2.extensions.connection or ConnectionPool
             Parameters to create a connection between end user and PSQL 
             server.
             
+        per_well : bool
+            One query per well. False by default.
+            
+        slicing : str
+            "unnest" (default) or "index" (server side array slicing, see
+            slice_index_query).
+            
+        binary : bool
+            Reads the single query result through binary COPY TO straight
+            into NumPy (see copy_to_numpy). well_name_column is returned
+            as a category. False by default. Not available with per_well
+            or bytea logs (ValueError).
+            
+        depth_table : str (optional)
+            Depth metadata table: arithmetic index slicing and skipping of
+            non overlapping wells (see slice_index_query).
+            
     RETURN
     ------
         DataFrame
             Collection of sampled logs by well.
     """
-    # Create empty df
     target_columns = [well_name_column, md_column, log_name]
-    df = pd.DataFrame(columns=target_columns)
-    for row in marker_df.values:  
-        filtered_unnested_query = slice_unnest_data_query(
-            row[0],
+    column_types = dict(zip(
+        fetch_column_names(target_table, connection), 
+        fetch_column_types(target_table, connection)
+    ))
+    md_type = column_types.get(md_column)
+    if binary and (per_well or md_type == "bytea"):
+        raise ValueError("binary reads need a single query over array logs (per_well=False)")
+    if md_type == "bytea":
+        # blobs are decoded & sliced client side
+        query_results = blob_logs_to_df(
+            marker_df, 
+            well_name_column, 
+            md_column, 
+            log_name, 
+            target_table, 
+            markers_table, 
+            connection, 
+            join_axis=join_axis
+        )
+    elif per_well:
+        query_results = []
+        for row in marker_df.values:  
+            filtered_unnested_query = slice_unnest_data_query(
+                row[0],
+                target_columns,
+                target_table, 
+                markers_table,
+                marker_df.columns[1],
+                row[1],
+                marker_df.columns[-1],
+                row[3],
+                join_axis=join_axis,
+                md_column_name=md_column,
+                slicing=slicing,
+                md_type=md_type,
+                depth_table=depth_table
+            )
+            # store query slice result
+            query_results += fetch_psql_command(filtered_unnested_query, connection)[1]
+    else:
+        filtered_unnested_query = slice_unnest_wells_query(
+            marker_df[marker_df.columns[0]].to_list(),
             target_columns,
             target_table, 
             markers_table,
             marker_df.columns[1],
-            row[1],
             marker_df.columns[-1],
-            row[3],
             join_axis=join_axis,
-            md_column_name=md_column
+            md_column_name=md_column,
+            slicing=slicing,
+            md_type=md_type,
+            depth_table=depth_table
         )
-        # store query slice result
-        query_result = fetch_psql_command(filtered_unnested_query, connection)
-        # construct a temporal df to store log of N well
-        temp_df = pd.DataFrame(data=query_result[1], columns=df.columns)
-        # truncate the 4th decimal of float columns
-        temp_df[[md_column,log_name]] = np.floor(
-            temp_df[[md_column,log_name]].astype("float").round(round_value)*(10**(round_value-1))
-        )/(10**(round_value-1))
-        # Append temporal df to df
-        df = df.append(temp_df, ignore_index=True)
+        if binary:
+            query_results = copy_to_numpy(
+                filtered_unnested_query,
+                connection,
+                [md_column, log_name],
+                categories={well_name_column: marker_df[marker_df.columns[0]].to_list()}
+            )
+        else:
+            query_results = fetch_psql_command(filtered_unnested_query, connection)[1]
+    # single DataFrame construction
+    df = pd.DataFrame(data=query_results, columns=target_columns)
+    # truncate the 4th decimal of float columns
+    df[[md_column,log_name]] = np.floor(
+        df[[md_column,log_name]].astype("float").round(round_value)*(10**(round_value-1))
+    )/(10**(round_value-1))
     return df
 
+def upscale_logs(
+    df,
+    cell_width=1,
+    how="mean",
+    well_name_column="well_name",
+    md_column="md_in_m",
+    log_columns=None
+):
+    """
+    Upscales well logs into regular depth cells.
+    
+    Cells start at each well's shallowest sample and are cell_width deep 
+    (top included, base excluded). Samples are binned with integer 
+    arithmetic and every well and log column is aggregated in a single 
+    grouped pass. Empty cells are not returned.
+    
+    ARGUMENTS
+    ---------
+        df : Pandas.DataFrame
+            Unnested logs, e.g. unnested_logs_to_df result.
+            
+        cell_width : float
+            Cell height in md units. 1 by default.
+            
+        how : str
+            Aggregation: "mean" or "arithmetic" (arithmetic average),
+            "median" or "harmonic" (harmonic average, non positive values
+            are ignored). "mean" by default.
+            
+        well_name_column : str
+            Well name column. "well_name" by default.
+            
+        md_column : str
+            Measured Depth column. "md_in_m" by default.
+            
+        log_columns : list (optional)
+            Columns to upscale. Every numeric column but md by default.
+            
+    RETURN
+    ------
+        DataFrame
+            well_name_column, md_column (top of the cell) and upscaled 
+            log_columns.
+    """
+    if log_columns is None:
+        log_columns = [
+            column for column in df.select_dtypes("number").columns 
+            if column != md_column
+        ]
+    md = df[md_column].astype("float").to_numpy()
+    top_depth = df.groupby(well_name_column)[md_column].transform("min").astype("float").to_numpy()
+    # cell index of every sample
+    cell = np.floor((md - top_depth) / cell_width).astype(np.int64)
+    logs = df[log_columns].astype("float")
+    keys = [df[well_name_column].to_numpy(), cell]
+    if how in ("mean", "arithmetic"):
+        upscaled_df = logs.groupby(keys).mean()
+    elif how == "median":
+        upscaled_df = logs.groupby(keys).median()
+    elif how == "harmonic":
+        inverse = 1 / logs.where(logs > 0)
+        grouped = inverse.groupby(keys)
+        upscaled_df = grouped.count() / grouped.sum(min_count=1)
+    else:
+        raise ValueError(f"Unknown upscaling method '{how}'")
+    upscaled_df.index.names = [well_name_column, "cell"]
+    upscaled_df = upscaled_df.reset_index()
+    well_top_depth = df.groupby(well_name_column)[md_column].min().astype("float")
+    upscaled_df.insert(
+        1,
+        md_column,
+        upscaled_df[well_name_column].map(well_top_depth) + upscaled_df["cell"] * cell_width
+    )
+    return upscaled_df.drop(columns="cell")
+
+# ASYNCHRONOUS API
+def concurrency_limit(connection, concurrency):
+    """
+    Creates the semaphore bounding concurrent calls of the async API.
+    
+    A single psycopg2 connection runs one statement at a time, so 
+    concurrency is only honored for ConnectionPool (up to its size).
+    
+    RETURN
+    ------
+        asyncio.Semaphore
+    """
+    if isinstance(connection, ConnectionPool):
+        return asyncio.Semaphore(max(1, min(concurrency, connection.maxconn)))
+    return asyncio.Semaphore(1)
+
+async def run_blocking(func, *args, semaphore=None, **kwargs):
+    """
+    Runs a blocking helper in the event loop's default executor, within
+    semaphore if given.
+    """
+    loop = asyncio.get_running_loop()
+    call = partial(func, *args, **kwargs)
+    if semaphore is None:
+        return await loop.run_in_executor(None, call)
+    async with semaphore:
+        return await loop.run_in_executor(None, call)
+
+async def async_execute_psql_command(command, connection, semaphore=None):
+    """
+    Asynchronous execute_psql_command.
+    """
+    return await run_blocking(execute_psql_command, command, connection, semaphore=semaphore)
+
+async def async_fetch_psql_command(command, connection, semaphore=None):
+    """
+    Asynchronous fetch_psql_command.
+    """
+    return await run_blocking(fetch_psql_command, command, connection, semaphore=semaphore)
+
+async def async_execute_psql_commands(commands, connection, concurrency=4):
+    """
+    Executes PSQL queries concurrently, each one in its own transaction.
+    
+    ARGUMENTS
+    ---------
+        commands : iterable
+            PSQL queries.
+        
+        connection : ConnectionPool or psycopg2.extensions.connection
+            Pool of connections (a single connection runs the commands one
+            at a time).
+            
+        concurrency : int
+            Maximum commands in flight. 4 by default.
+    
+    RETURN
+    ------
+        list
+            execute_psql_command results, in commands order.
+    """
+    semaphore = concurrency_limit(connection, concurrency)
+    return await asyncio.gather(*[
+        async_execute_psql_command(command, connection, semaphore) for command in commands
+    ])
+
+async def async_fetch_psql_commands(commands, connection, concurrency=4):
+    """
+    Fetches many queries concurrently. See async_execute_psql_commands.
+    
+    RETURN
+    ------
+        list
+            fetch_psql_command results, in commands order.
+    """
+    semaphore = concurrency_limit(connection, concurrency)
+    return await asyncio.gather(*[
+        async_fetch_psql_command(command, connection, semaphore) for command in commands
+    ])
+
+async def async_unnested_logs_to_df(
+    marker_df,
+    well_name_column,
+    md_column,
+    log_name,
+    target_table, 
+    markers_table,
+    connection,
+    concurrency=4,
+    wells_per_query=None,
+    **kwargs
+):
+    """
+    Asynchronous unnested_logs_to_df: wells are split into groups of 
+    wells_per_query, sliced concurrently and concatenated in marker_df 
+    order.
+    
+    ARGUMENTS
+    ---------
+        concurrency : int
+            Maximum queries in flight. 4 by default.
+            
+        wells_per_query : int
+            Wells per query. marker_df is split evenly across concurrency
+            queries by default.
+            
+        Other arguments and keyword arguments: see unnested_logs_to_df.
+    
+    RETURN
+    ------
+        DataFrame
+            Collection of sampled logs by well.
+    """
+    if wells_per_query is None:
+        wells_per_query = max(1, -(-len(marker_df) // max(concurrency, 1)))
+    # warm the schema cache once instead of once per group
+    await run_blocking(fetch_column_types, target_table, connection)
+    semaphore = concurrency_limit(connection, concurrency)
+    dfs = await asyncio.gather(*[
+        run_blocking(
+            unnested_logs_to_df,
+            marker_df.iloc[start:start + wells_per_query],
+            well_name_column,
+            md_column,
+            log_name,
+            target_table,
+            markers_table,
+            connection,
+            semaphore=semaphore,
+            **kwargs
+        )
+        for start in range(0, len(marker_df), wells_per_query)
+    ])
+    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame(
+        columns=[well_name_column, md_column, log_name]
+    )
+
 # DEPRECATED FUNCTIONS
 
 def nested_logs_to_py(
@@ -0,0 +1,145 @@
+"""
+Binary COPY encoding (array_to_copy_binary, copy_binary_row), parsing
+(copy_to_numpy) and log hashing (log_content_hash).
+"""
+import os
+import struct
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import py_to_psql as pp
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def copy_expert(self, statement, file):
+        self.connection.statements.append(statement)
+        if isinstance(self.connection.payload, Exception):
+            raise self.connection.payload
+        file.write(self.connection.payload)
+
+class FakeConnection:
+    """
+    Serves payload (COPY TO STDOUT bytes, or an exception to raise).
+    """
+    closed = 0
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self, name=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+def parse_float8_array(field):
+    """
+    Decodes a binary COPY float8[] field (length prefix included).
+    """
+    length, ndim, has_nulls, oid, size, lower_bound = struct.unpack_from("!iiiiii", field)
+    assert (length, ndim, oid, lower_bound) == (len(field) - 4, 1, pp.FLOAT8_OID, 1)
+    offset = 24
+    values = []
+    for _ in range(size):
+        element_length = struct.unpack_from("!i", field, offset)[0]
+        offset += 4
+        if element_length == -1:
+            values.append(None)
+            continue
+        assert element_length == 8
+        values.append(struct.unpack_from("!d", field, offset)[0])
+        offset += 8
+    assert offset == len(field)
+    return bool(has_nulls), values
+
+def test_array_to_copy_binary_layout():
+    field = pp.array_to_copy_binary(np.array([1.5, -2.25, 1e10]))
+    assert len(field) == 4 + 20 + 3 * 12
+    assert parse_float8_array(field) == (False, [1.5, -2.25, 1e10])
+
+def test_array_to_copy_binary_nulls_carry_no_value_bytes():
+    field = pp.array_to_copy_binary(pp.encode_log_array([1.5, 1e30, np.nan, 3.0]))
+    assert len(field) == 4 + 20 + 2 * 12 + 2 * 4
+    assert parse_float8_array(field) == (True, [1.5, None, None, 3.0])
+
+def test_array_to_copy_binary_empty():
+    assert parse_float8_array(pp.array_to_copy_binary(np.array([]))) == (False, [])
+
+def test_copy_binary_row_layout():
+    row = pp.copy_binary_row(["F02-1", None, b"\x00\x01", np.array([2.0])])
+    assert struct.unpack_from("!h", row)[0] == 4
+    assert row[2:11] == struct.pack("!i", 5) + b"F02-1"
+    assert row[11:15] == struct.pack("!i", -1)
+    assert row[15:21] == struct.pack("!i", 2) + b"\x00\x01"
+    assert parse_float8_array(row[21:]) == (False, [2.0])
+
+def copy_to_stdout(records):
+    """
+    Binary COPY TO payload of (int4 code, float8 value) tuples, framed by
+    binary_copy_stream.
+    """
+    rows = [
+        struct.pack("!hiiid", 2, 4, code, 8, value) for code, value in records
+    ]
+    return b"".join(pp.binary_copy_stream(rows))
+
+def test_copy_to_numpy_parses_binary_copy_stream():
+    connection = FakeConnection(copy_to_stdout([(1, 1.5), (0, np.nan), (-1, -3.0)]))
+    result = pp.copy_to_numpy(
+        "SELECT well_name, gr FROM logs",
+        connection,
+        ["gr"],
+        categories={"well_name": ["F02-1", "F03'4", "F02-1"]}
+    )
+    assert connection.commits == 1
+    statement = connection.statements[0]
+    # duplicated categories are dropped, values quoted as literals
+    assert "ARRAY['F02-1', 'F03''4']::text[]" in statement
+    assert "(FORMAT binary)" in statement
+    assert result["well_name"].categories.tolist() == ["F02-1", "F03'4"]
+    assert result["well_name"].astype(object).tolist()[:2] == ["F03'4", "F02-1"]
+    assert pd.isna(result["well_name"][2])
+    assert result["gr"].dtype == np.float64 and result["gr"].dtype.isnative
+    np.testing.assert_array_equal(result["gr"], [1.5, np.nan, -3.0])
+
+def test_copy_to_numpy_empty_result():
+    result = pp.copy_to_numpy("SELECT gr FROM logs", FakeConnection(copy_to_stdout([])), ["gr"])
+    assert len(result["gr"]) == 0
+
+def test_copy_to_numpy_rolls_back_and_raises():
+    connection = FakeConnection(RuntimeError("lost connection"))
+    with pytest.raises(RuntimeError):
+        pp.copy_to_numpy("SELECT gr FROM logs", connection, ["gr"])
+    assert (connection.commits, connection.rollbacks) == (0, 1)
+
+def test_log_content_hash():
+    log = ([100.0, 100.5, 101.0], [10.0, 1e30, 30.0])
+    digest, sample_count = pp.log_content_hash(log)
+    assert sample_count == 3
+    # list, ndarray and NaN spelled undefined samples hash alike
+    assert pp.log_content_hash(tuple(np.array(array) for array in log)) == (digest, 3)
+    assert pp.log_content_hash((log[0], [10.0, np.nan, 30.0]))[0] == digest
+    assert pp.log_content_hash((log[0], [10.0, 20.0, 30.0]))[0] != digest
+    # array boundaries are part of the content
+    assert pp.log_content_hash(([1.0, 2.0], [3.0]))[0] != pp.log_content_hash(([1.0], [2.0, 3.0]))[0]
+
+def test_log_content_hash_empty_log():
+    assert pp.log_content_hash([]) == pp.log_content_hash(None)
+    assert pp.log_content_hash([])[1] == 0
@@ -0,0 +1,44 @@
+"""
+COPY text serialization of DataFrames and CSV chunks (df_copy_rows).
+"""
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import py_to_psql as pp
+
+def copy_text(df, chunk_size=10000, column_types=None):
+    return "".join(pp.df_copy_rows(df, chunk_size, column_types))
+
+def test_string_dtype_is_escaped():
+    df = pd.DataFrame({
+        "well_name": pd.Series(["A\tB", "C\\D", "E\nF", None], dtype="string"),
+        "md": [1.5, 2.5, np.nan, 4.0]
+    })
+    assert copy_text(df) == "A\\tB\t1.5\nC\\\\D\t2.5\nE\\nF\t\\N\n\\N\t4.0\n"
+
+def test_object_dtype_is_escaped():
+    df = pd.DataFrame({"well_name": pd.Series(["A\tB", None], dtype=object)})
+    assert copy_text(df) == "A\\tB\n\\N\n"
+
+def test_float_column_into_integer_column():
+    df = pd.DataFrame({"litho_id": [1.0, np.nan, 3.0], "pct": [1.0, np.nan, 3.0]})
+    assert copy_text(df, column_types=["integer", "numeric"]) == "1\t1.0\n\\N\t\\N\n3\t3.0\n"
+
+def test_fractional_float_into_integer_column_raises():
+    df = pd.DataFrame({"litho_id": [1.5]})
+    with pytest.raises(TypeError):
+        copy_text(df, column_types=["integer"])
+
+def test_csv_chunk_with_nan_in_integer_column(tmp_path):
+    csv_path = tmp_path / "litho.csv"
+    csv_path.write_text("litho_id,litho_1\n1,Sand\tstone\n2,Shale\n,Halite\n4,\n")
+    column_types = ["integer", "character varying"]
+    copied = [
+        copy_text(pp.format_csv_df(chunk), len(chunk), column_types)
+        for chunk in pp.read_csv_chunks(csv_path, chunk_size=2)
+    ]
+    assert copied == ["1\tSand\\tstone\n2\tShale\n", "\\N\tHalite\n4\t\\N\n"]
@@ -0,0 +1,130 @@
+"""
+On-disk wellman log cache (WellLogCache), over the synthetic wellman of
+benchmarks/fake_wellman.py.
+"""
+import json
+import os
+import sys
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+import fake_wellman
+fake_wellman.install()
+import opendtect_to_py as op
+
+LOG_NAME = "DT"
+# two float64 arrays of 50 samples, .npy headers included
+LOG_BYTES = 2 * (128 + 50 * 8)
+
+@pytest.fixture
+def wellman_reads(monkeypatch):
+    monkeypatch.setitem(fake_wellman.SETTINGS, "n_samples", 50)
+    reads = []
+    get_log = fake_wellman.getLog
+    def counted_get_log(well_name, log_name):
+        reads.append((well_name, log_name))
+        return get_log(well_name, log_name)
+    monkeypatch.setattr(fake_wellman, "getLog", counted_get_log)
+    return reads
+
+@pytest.fixture
+def survey_dir(tmp_path):
+    well_info_dir = tmp_path / "F3_Demo" / "WellInfo"
+    well_info_dir.mkdir(parents=True)
+    for well_name in ["BENCH-00001", "BENCH-00010"]:
+        (well_info_dir / f"{well_name}.well").write_text(well_name)
+    return tmp_path / "F3_Demo"
+
+def new_cache(tmp_path, survey_dir, max_bytes=2 * 1024**3):
+    return op.WellLogCache(str(tmp_path / "cache"), str(survey_dir), max_bytes)
+
+def cache_files(tmp_path):
+    return sorted(os.listdir(tmp_path / "cache"))
+
+def test_miss_then_hit(tmp_path, survey_dir, wellman_reads):
+    cache = new_cache(tmp_path, survey_dir)
+    log = cache.get("BENCH-00001", LOG_NAME)
+    cached_log = cache.get("BENCH-00001", LOG_NAME)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert wellman_reads == [("BENCH-00001", LOG_NAME)]
+    # misses return wellman's arrays, hits read only memory maps of them
+    for array, cached_array in zip(log, cached_log):
+        np.testing.assert_array_equal(cached_array, array)
+    assert isinstance(cached_log[0], np.memmap) and not cached_log[0].flags.writeable
+
+def test_index_persists_across_instances(tmp_path, survey_dir, wellman_reads):
+    new_cache(tmp_path, survey_dir).get("BENCH-00001", LOG_NAME)
+    cache = new_cache(tmp_path, survey_dir)
+    cache.get("BENCH-00001", LOG_NAME)
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert len(wellman_reads) == 1
+
+def test_missing_log_is_cached(tmp_path, survey_dir, wellman_reads):
+    cache = new_cache(tmp_path, survey_dir)
+    # every fifth well lacks the joined logs
+    assert cache.get("BENCH-00004", fake_wellman.LOG_NAMES[0]) == []
+    assert cache.get("BENCH-00004", fake_wellman.LOG_NAMES[0]) == []
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(wellman_reads) == 1
+
+def test_read_errors_are_not_cached(tmp_path, survey_dir, monkeypatch):
+    def failing_get_log(well_name, log_name):
+        raise OSError("survey unreachable")
+    monkeypatch.setattr(fake_wellman, "getLog", failing_get_log)
+    cache = new_cache(tmp_path, survey_dir)
+    with pytest.raises(OSError):
+        cache.get("BENCH-00001", LOG_NAME)
+    assert cache_files(tmp_path) == []
+
+def test_source_change_invalidates_only_its_well(tmp_path, survey_dir, wellman_reads):
+    cache = new_cache(tmp_path, survey_dir)
+    cache.get("BENCH-00001", LOG_NAME)
+    cache.get("BENCH-00010", LOG_NAME)
+    well_file = survey_dir / "WellInfo" / "BENCH-00010.well"
+    os.utime(well_file, (well_file.stat().st_atime, well_file.stat().st_mtime + 60))
+    cache.get("BENCH-00001", LOG_NAME)
+    cache.get("BENCH-00010", LOG_NAME)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+def test_least_recently_used_is_evicted(tmp_path, survey_dir, wellman_reads):
+    cache = new_cache(tmp_path, survey_dir, max_bytes=2 * LOG_BYTES)
+    cache.get("BENCH-00001", LOG_NAME)
+    cache.get("BENCH-00002", LOG_NAME)
+    cache.get("BENCH-00001", LOG_NAME)
+    cache.get("BENCH-00003", LOG_NAME)
+    # BENCH-00002 was evicted, its files removed
+    assert len([name for name in cache_files(tmp_path) if name.endswith(".npy")]) == 4
+    cache.get("BENCH-00001", LOG_NAME)
+    cache.get("BENCH-00002", LOG_NAME)
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert [read[0] for read in wellman_reads] == [
+        "BENCH-00001", "BENCH-00002", "BENCH-00003", "BENCH-00002"
+    ]
+
+def test_failed_write_leaves_no_partial_file(tmp_path, survey_dir, wellman_reads):
+    cache = new_cache(tmp_path, survey_dir)
+    cache.get("BENCH-00001", LOG_NAME)
+    files = cache_files(tmp_path)
+    index_path = tmp_path / "cache" / "index.json"
+    index = json.loads(index_path.read_text())
+    def partial_write(index_file):
+        index_file.write(b'{"truncated')
+        raise OSError("disk full")
+    with pytest.raises(OSError):
+        cache._write_atomic(str(index_path), partial_write)
+    assert cache_files(tmp_path) == files
+    assert json.loads(index_path.read_text()) == index
+
+def test_suggest_log_names():
+    available_logs = ["Raw CDA Logs`GR [D]", "Joined Well Logs`GR", "GRN", "DT", "gr_corr"]
+    assert op.suggest_log_names("gr", available_logs) == [
+        "Raw CDA Logs`GR [D]", "Joined Well Logs`GR", "gr_corr"
+    ]
+    # available fallbacks first, once
+    assert op.suggest_log_names(
+        "GR", available_logs, ["Joined Well Logs`GR", "Missing`GR"]
+    ) == ["Joined Well Logs`GR", "Raw CDA Logs`GR [D]", "gr_corr"]
+    assert op.suggest_log_names("rhob", available_logs) == []
@@ -0,0 +1,94 @@
+"""
+Stage spans, histograms and their exports (Metrics).
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import py_to_psql as pp
+
+def recorded_metrics():
+    metrics = pp.Metrics()
+    with metrics.labels(well="F02-1", log="GR"):
+        metrics.record("wellman_fetch", 0.002)
+        metrics.record("serialize", 0.02)
+    with metrics.labels(well="F03-4", log='Raw CDA Logs`GR "D"'):
+        metrics.record("wellman_fetch", 0.5)
+    metrics.record("commit", 120.0)
+    return metrics
+
+def test_labels_nest_and_reset():
+    metrics = pp.Metrics()
+    with metrics.labels(well="F02-1"):
+        with metrics.labels(log="GR"):
+            metrics.record("serialize", 0.1)
+        metrics.record("execute", 0.2, log="DT")
+    metrics.record("commit", 0.3)
+    assert [labels for _, labels, _ in metrics.spans] == [
+        {"well": "F02-1", "log": "GR"}, {"well": "F02-1", "log": "DT"}, {}
+    ]
+
+def test_span_timing_and_hooks():
+    metrics = pp.Metrics()
+    hooked = []
+    metrics.hooks.append(lambda stage, labels, elapsed: hooked.append((stage, labels)))
+    with metrics.span("copy", well="F02-1"):
+        pass
+    assert hooked == [("copy", {"well": "F02-1"})]
+    assert metrics.spans[0][2] >= 0
+    metrics.enabled = False
+    with metrics.span("copy"):
+        pass
+    assert len(metrics.spans) == 1
+
+def test_max_spans_keeps_histograms():
+    metrics = pp.Metrics(max_spans=2)
+    for _ in range(5):
+        metrics.record("execute", 0.01)
+    assert len(metrics.spans) == 2
+    assert metrics.histograms()[0]["count"] == 5
+
+def test_histograms_and_totals():
+    metrics = recorded_metrics()
+    histograms = {(item["stage"], item["log"]): item for item in metrics.histograms()}
+    assert sorted(histograms) == [
+        ("commit", None), ("serialize", "GR"), ("wellman_fetch", "GR"),
+        ("wellman_fetch", 'Raw CDA Logs`GR "D"')
+    ]
+    # cumulative buckets: 0.002 s is counted from the 0.005 s bound up
+    buckets = histograms[("wellman_fetch", "GR")]["buckets"]
+    assert [buckets[bound] for bound in ["0.001", "0.005", "60.0"]] == [0, 1, 1]
+    assert histograms[("commit", None)]["buckets"]["60.0"] == 0
+    assert metrics.totals("well") == {
+        "F02-1": {"wellman_fetch": 0.002, "serialize": 0.02},
+        "F03-4": {"wellman_fetch": 0.5},
+        None: {"commit": 120.0}
+    }
+    metrics.reset()
+    assert metrics.histograms() == [] and metrics.totals() == {}
+
+def test_to_json(tmp_path):
+    metrics = recorded_metrics()
+    json_path = tmp_path / "metrics.json"
+    content = metrics.to_json(json_path)
+    assert json_path.read_text() == content
+    exported = json.loads(content)
+    assert exported["histograms"] == json.loads(json.dumps(metrics.histograms()))
+    assert exported["wells"]["F03-4"] == {"wellman_fetch": 0.5}
+    assert exported["wells"]["null"] == {"commit": 120.0}
+
+def test_to_prometheus():
+    lines = recorded_metrics().to_prometheus(prefix="test").splitlines()
+    name = "test_stage_seconds"
+    assert lines[:2] == [
+        f"# HELP {name} Time spent per ingest/query stage.", f"# TYPE {name} histogram"
+    ]
+    assert f'{name}_bucket{{stage="commit",le="60.0"}} 0' in lines
+    assert f'{name}_bucket{{stage="commit",le="+Inf"}} 1' in lines
+    assert f'{name}_sum{{stage="commit"}} 120.0' in lines
+    assert f'{name}_count{{stage="serialize",log="GR"}} 1' in lines
+    # label values are escaped
+    assert f'{name}_count{{stage="wellman_fetch",log="Raw CDA Logs`GR \\"D\\""}} 1' in lines
+    # buckets, +Inf, sum and count per stage and log
+    assert len(lines) == 2 + 4 * (len(pp.Metrics.BUCKETS) + 3)
@@ -0,0 +1,48 @@
+"""
+Upscaling of unnested logs into regular depth cells (upscale_logs).
+"""
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import py_to_psql as pp
+
+def unnested_df():
+    return pd.DataFrame({
+        "well_name": ["A", "A", "A", "A", "B", "B", "B"],
+        "md_in_m": [100.0, 100.5, 101.0, 103.2, 50.0, 50.9, 51.0],
+        "gr": [10.0, 20.0, 30.0, 40.0, 1.0, 4.0, np.nan],
+        "dt": [1.0, 2.0, 4.0, 8.0, 2.0, -1.0, 2.0]
+    })
+
+def test_mean_cells_start_at_each_well_top():
+    upscaled_df = pp.upscale_logs(unnested_df())
+    assert upscaled_df.columns.tolist() == ["well_name", "md_in_m", "gr", "dt"]
+    # empty cells (A at 102 m) are not returned, base is excluded
+    assert upscaled_df["well_name"].tolist() == ["A", "A", "A", "B", "B"]
+    assert upscaled_df["md_in_m"].tolist() == [100.0, 101.0, 103.0, 50.0, 51.0]
+    np.testing.assert_allclose(upscaled_df["gr"], [15.0, 30.0, 40.0, 2.5, np.nan])
+    np.testing.assert_allclose(upscaled_df["dt"], [1.5, 4.0, 8.0, 0.5, 2.0])
+
+def test_cell_width_and_log_columns():
+    upscaled_df = pp.upscale_logs(unnested_df(), cell_width=2, log_columns=["gr"])
+    assert upscaled_df.columns.tolist() == ["well_name", "md_in_m", "gr"]
+    assert upscaled_df["md_in_m"].tolist() == [100.0, 102.0, 50.0]
+    np.testing.assert_allclose(upscaled_df["gr"], [20.0, 40.0, 2.5])
+
+def test_median():
+    upscaled_df = pp.upscale_logs(unnested_df(), cell_width=10, how="median")
+    np.testing.assert_allclose(upscaled_df["gr"], [25.0, 2.5])
+    np.testing.assert_allclose(upscaled_df["dt"], [3.0, 2.0])
+
+def test_harmonic_ignores_non_positive_values():
+    upscaled_df = pp.upscale_logs(unnested_df(), how="harmonic")
+    np.testing.assert_allclose(upscaled_df["gr"], [2 / (1 / 10 + 1 / 20), 30.0, 40.0, 1.6, np.nan])
+    np.testing.assert_allclose(upscaled_df["dt"], [4 / 3, 4.0, 8.0, 2.0, 2.0])
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        pp.upscale_logs(unnested_df(), how="geometric")